@@ -21,7 +21,7 @@ Created: 2025-08-17
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Union
 import time
 import json
 
@@ -39,7 +39,10 @@ from stock_etl.utils.dag_utils import (
     determine_execution_mode, 
     should_skip_execution, 
     get_schema_from_context,
+    parse_dag_context,
     log_execution_summary,
+    ExecutionConfig,
+    ParsedContext,
     ETLLogger
 )
 from stock_etl.utils.polish_trading_calendar import polish_calendar
@@ -187,7 +190,8 @@ def check_execution_prerequisites(**context) -> str:
     
     try:
         # Determine execution mode and configuration
-        mode, config = determine_execution_mode(context)
+        parsed_context = parse_dag_context(context)
+        mode, config = determine_execution_mode(parsed_context)
         
         # Check if execution should be skipped
         should_skip, skip_reason = should_skip_execution(config)
@@ -198,7 +202,7 @@ def check_execution_prerequisites(**context) -> str:
             return 'skip_execution'
         
         # Store execution config in XCom for downstream tasks
-        context['task_instance'].xcom_push(key='execution_config', value=config)
+        context['task_instance'].xcom_push(key='execution_config', value=config.to_dict())
         logger.info(f"Prerequisites passed - proceeding with {mode} mode")
         return 'proceed_with_etl'
         
@@ -314,6 +318,9 @@ def extract_and_transform_data(**context) -> Dict[str, Any]:
     logger = ETLLogger('extract_transform').get_logger()
     start_time = time.time()
     
+    # Parsed once and reused by the per-instrument strategy checks and the failure handler
+    parsed_context = parse_dag_context(context)
+    
     try:
         # Get job context
         job_id = context['task_instance'].xcom_pull(task_ids='create_etl_job')
@@ -341,7 +348,7 @@ def extract_and_transform_data(**context) -> Dict[str, Any]:
                 error_msg = f"Stooq modules not available for {environment} environment: {IMPORT_ERROR}"
                 logger.error(error_msg)
                 raise ImportError(error_msg)
-            extracted_data = _extract_stooq_data(target_date, target_schema, logger, context)
+            extracted_data = _extract_stooq_data(target_date, target_schema, logger, parsed_context)
         
         processing_time_ms = int((time.time() - start_time) * 1000)
         
@@ -370,7 +377,7 @@ def extract_and_transform_data(**context) -> Dict[str, Any]:
             with postgres_hook.get_conn() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(f"""
-                    UPDATE {get_schema_from_context(context)}.etl_jobs 
+                    UPDATE {get_schema_from_context(parsed_context)}.etl_jobs 
                     SET status = 'failed', error_message = %s 
                     WHERE id = %s
                     """, (str(e), job_id))
@@ -965,7 +972,7 @@ def finalize_etl_session(**context) -> None:
             key='execution_config'
         ) or {}
         if execution_config:
-            log_execution_summary(execution_config, final_summary)
+            log_execution_summary(ExecutionConfig.from_dict(execution_config), final_summary)
         else:
             logger.info("No execution config found - skipping execution summary (likely testing mode)")
         
@@ -1043,7 +1050,8 @@ def _extract_mock_data(target_date, logger):
     }
 
 
-def determine_extraction_strategy(symbol: str, instrument_type: str, target_schema: str, context: Dict[str, Any]) -> Tuple[str, str, int]:
+def determine_extraction_strategy(symbol: str, instrument_type: str, target_schema: str,
+                                  context: Union[Dict[str, Any], ParsedContext]) -> Tuple[str, str, int]:
     """
     Intelligent extraction strategy determination based on database state and context.
     
@@ -1051,7 +1059,7 @@ def determine_extraction_strategy(symbol: str, instrument_type: str, target_sche
         symbol: Stock/index symbol
         instrument_type: 'stock' or 'index'
         target_schema: Database schema to check
-        context: Airflow task context
+        context: Airflow task context or ParsedContext (parsed once per task by the caller)
     
     Returns:
         Tuple of (strategy, reason, max_records_to_process)
@@ -1062,10 +1070,10 @@ def determine_extraction_strategy(symbol: str, instrument_type: str, target_sche
     from airflow.providers.postgres.hooks.postgres import PostgresHook
     
     postgres_hook = PostgresHook(postgres_conn_id='postgres_default')
+    parsed_context = parse_dag_context(context)
     
     # Layer 1: Check explicit configuration override
-    conf = context.get('dag_run', {}).conf if context.get('dag_run') else {}
-    manual_conf = conf if conf else {}
+    manual_conf = parsed_context.conf
     
     # Check for instrument-specific override
     instrument_overrides = manual_conf.get('instruments', {})
@@ -1134,7 +1142,7 @@ def determine_extraction_strategy(symbol: str, instrument_type: str, target_sche
         pass
     
     # Layer 3: DAG execution mode fallback
-    mode, config = determine_execution_mode(context)
+    mode, config = determine_execution_mode(parsed_context)
     if mode == 'backfill':
         return 'historical', f'Backfill execution mode detected', -1  # -1 = unlimited backfill
     
@@ -1150,7 +1158,7 @@ def _extract_stooq_data(target_date, target_schema, logger, context):
         target_date: Target date for extraction
         target_schema: Database schema
         logger: Logger instance
-        context: Airflow task context for strategy determination
+        context: ParsedContext (or raw Airflow task context) for strategy determination
     """
     try:
         # Initialize the StooqExtractor
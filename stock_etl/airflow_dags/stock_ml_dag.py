@@ -19,6 +19,14 @@ from typing import Dict, List, Any
 import json
 import os
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 from airflow.providers.postgres.hooks.postgres import PostgresHook
@@ -311,13 +319,48 @@ def create_ml_etl_job(**context) -> int:
         raise
 
 
+def _orjson_default(obj: Any) -> Any:
+    """orjson fallback: numpy values it cannot serialize natively become lists/scalars, anything else a string"""
+    if isinstance(obj, np.ndarray):  # e.g. non-contiguous arrays such as cv_results_ columns
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def _to_serializable(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert numpy arrays/scalars (at any depth) to plain Python values.
+    
+    orjson serializes numpy natively in C; arrays it cannot handle natively are
+    converted via tolist(), and other unsupported objects (DataFrames, estimators)
+    fall back to their string form, matching the previous behaviour.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(orjson.dumps(
+            payload,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=_orjson_default
+        ))
+    
+    serializable = {}
+    for key, value in payload.items():
+        if hasattr(value, 'tolist'):  # Convert numpy arrays to lists
+            serializable[key] = value.tolist()
+        elif isinstance(value, (int, float, str, bool, list, dict)):
+            serializable[key] = value
+        else:
+            serializable[key] = str(value)
+    return serializable
+
+
 def train_ml_model(**context) -> Dict[str, Any]:
     """Complete ML training pipeline for this stock and environment"""
     import time
     from datetime import datetime, date
     
     logger = ETLLogger('ml_training').get_logger()
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     # Get context from previous tasks - handle dynamic task IDs
     task_id_parts = context['task'].task_id.split('_')
@@ -423,6 +466,12 @@ def train_ml_model(**context) -> Dict[str, Any]:
         
         logger.info(f"✅ Preprocessing completed - Features: {processed_data['original_feature_count']} → {processed_data['final_feature_count']}")
         
+        # Features now live in processed_data; keep only the test columns backtesting reads
+        backtest_columns = [col for col in ('trading_date_local', 'close_price', 'growth_future_7d')
+                            if col in test_df.columns]
+        test_data = test_df[backtest_columns]
+        del train_df, val_df, test_df
+        
         # Step 5: Model Training
         logger.info(f"🤖 Step 5: XGBoost model training for {stock_symbol}")
         trainer = HighPerformanceXGBoostTrainer()
@@ -467,8 +516,7 @@ def train_ml_model(**context) -> Dict[str, Any]:
         logger.info(f"💰 Step 6: Backtesting trading strategy for {stock_symbol}")
         backtester = TradingBacktester()
         
-        # Prepare data for backtesting - reconstruct test data from splits
-        test_data = test_df.copy()  # Use the original test_df from splitting
+        # Backtest on the narrow test slice kept after preprocessing
         test_predictions = training_results['test_predictions']
         test_probabilities = training_results['test_probabilities']
         
@@ -530,16 +578,9 @@ def train_ml_model(**context) -> Dict[str, Any]:
                 raise ValueError(f"Instrument ID not found for symbol {stock_symbol}")
             
             # Prepare serializable training results (remove DataFrames and non-serializable objects)
-            serializable_training_results = {}
-            for key, value in training_results.items():
-                if key in ['model']:  # Skip model object
-                    continue
-                elif hasattr(value, 'tolist'):  # Convert numpy arrays to lists
-                    serializable_training_results[key] = value.tolist()
-                elif isinstance(value, (int, float, str, bool, list, dict)):
-                    serializable_training_results[key] = value
-                else:
-                    serializable_training_results[key] = str(value)
+            serializable_training_results = _to_serializable(
+                {key: value for key, value in training_results.items() if key != 'model'}
+            )
             
             # Configure database operations for target schema
             ml_db_ops = MLDatabaseOperations(
@@ -547,70 +588,59 @@ def train_ml_model(**context) -> Dict[str, Any]:
                 target_schema=target_schema
             )
             
-            # Store model record with metadata and metrics
-            model_id = ml_db_ops.save_model_record(
-                instrument_id=instrument_id,
-                symbol=stock_symbol,
-                model_version=model_version,
-                model_file_path=f"/models/{stock_symbol}_{model_version}.pkl",
-                model_hash=hashlib.md5(str(serializable_training_results).encode()).hexdigest(),
-                model_size=len(str(serializable_training_results)),
-                hyperparameters=training_results.get('best_params', {}),
-                feature_count=processed_data['final_feature_count'],
-                training_results=serializable_training_results,
-                airflow_context={
-                    'dag_id': training_config['dag_id'],
-                    'run_id': training_config['run_id'],
-                    'environment': environment,
-                    'target_schema': target_schema,
-                    'target_days': training_config['target_days']
-                },
-                is_production=(environment == 'prod')  # Only production models marked as production
-            )
-            
-            # Store feature data (using original engineered data)
-            feature_data_id = ml_db_ops.save_feature_data(
-                model_id=model_id,
-                instrument_id=instrument_id,
-                feature_df=engineered_data,  # Use the engineered DataFrame
-                symbol=stock_symbol
-            )
+            # Save all artifacts for this symbol in one transaction
+            with ml_db_ops.pipeline_session():
+                # Store model record with metadata and metrics
+                model_id = ml_db_ops.save_model_record(
+                    instrument_id=instrument_id,
+                    symbol=stock_symbol,
+                    model_version=model_version,
+                    model_file_path=f"/models/{stock_symbol}_{model_version}.pkl",
+                    model_hash=hashlib.md5(str(serializable_training_results).encode()).hexdigest(),
+                    model_size=len(str(serializable_training_results)),
+                    hyperparameters=training_results.get('best_params', {}),
+                    feature_count=processed_data['final_feature_count'],
+                    training_results=serializable_training_results,
+                    airflow_context={
+                        'dag_id': training_config['dag_id'],
+                        'run_id': training_config['run_id'],
+                        'environment': environment,
+                        'target_schema': target_schema,
+                        'target_days': training_config['target_days']
+                    },
+                    is_production=(environment == 'prod')  # Only production models marked as production
+                )
             
-            # Store predictions for future analysis
-            # Rejoin trading_date_local from original engineered_data using test_data index
-            if 'trading_date_local' in test_data.columns:
-                # trading_date_local is still available
-                test_dates = [pd.to_datetime(td).date() for td in test_data['trading_date_local']]
-            else:
-                # trading_date_local was dropped during preprocessing - rejoin from engineered_data
-                test_dates_series = engineered_data.loc[test_data.index, 'trading_date_local']
-                test_dates = [pd.to_datetime(td).date() for td in test_dates_series]
+                # Store feature data (using original engineered data)
+                feature_data_id = ml_db_ops.save_feature_data(
+                    model_id=model_id,
+                    instrument_id=instrument_id,
+                    feature_df=engineered_data,  # Use the engineered DataFrame
+                    symbol=stock_symbol
+                )
             
-            logger.info(f"✅ Extracted {len(test_dates)} actual trading dates for {stock_symbol} predictions")
+                # Store predictions for future analysis
+                # Rejoin trading_date_local from original engineered_data using test_data index
+                if 'trading_date_local' in test_data.columns:
+                    # trading_date_local is still available
+                    test_dates = [pd.to_datetime(td).date() for td in test_data['trading_date_local']]
+                else:
+                    # trading_date_local was dropped during preprocessing - rejoin from engineered_data
+                    test_dates_series = engineered_data.loc[test_data.index, 'trading_date_local']
+                    test_dates = [pd.to_datetime(td).date() for td in test_dates_series]
             
-            # Validate alignment
-            if len(test_dates) != len(test_predictions):
-                raise ValueError(f"Date/prediction mismatch for {stock_symbol}: {len(test_dates)} dates vs {len(test_predictions)} predictions")
+                logger.info(f"✅ Extracted {len(test_dates)} actual trading dates for {stock_symbol} predictions")
             
-            prediction_id = ml_db_ops.save_predictions(
-                model_id=model_id,
-                instrument_id=instrument_id,
-                predictions=test_predictions.tolist() if hasattr(test_predictions, 'tolist') else list(test_predictions),
-                probabilities=test_probabilities.tolist() if hasattr(test_probabilities, 'tolist') else list(test_probabilities),
-                test_dates=test_dates,
-                symbol=stock_symbol,
-                airflow_context={
-                    'dag_id': training_config['dag_id'],
-                    'run_id': training_config['run_id']
-                }
-            )
+                # Validate alignment
+                if len(test_dates) != len(test_predictions):
+                    raise ValueError(f"Date/prediction mismatch for {stock_symbol}: {len(test_dates)} dates vs {len(test_predictions)} predictions")
             
-            # Store backtesting results
-            if backtest_results and stock_symbol in backtest_results:
-                backtest_id = ml_db_ops.save_backtest_results(
+                prediction_id = ml_db_ops.save_predictions(
                     model_id=model_id,
                     instrument_id=instrument_id,
-                    backtest_results=backtest_results[stock_symbol],
+                    predictions=test_predictions.tolist() if hasattr(test_predictions, 'tolist') else list(test_predictions),
+                    probabilities=test_probabilities.tolist() if hasattr(test_probabilities, 'tolist') else list(test_probabilities),
+                    test_dates=test_dates,
                     symbol=stock_symbol,
                     airflow_context={
                         'dag_id': training_config['dag_id'],
@@ -618,6 +648,19 @@ def train_ml_model(**context) -> Dict[str, Any]:
                     }
                 )
             
+                # Store backtesting results
+                if backtest_results and stock_symbol in backtest_results:
+                    backtest_id = ml_db_ops.save_backtest_results(
+                        model_id=model_id,
+                        instrument_id=instrument_id,
+                        backtest_results=backtest_results[stock_symbol],
+                        symbol=stock_symbol,
+                        airflow_context={
+                            'dag_id': training_config['dag_id'],
+                            'run_id': training_config['run_id']
+                        }
+                    )
+            
             database_stored = True
             logger.info(f"✅ ML results stored successfully in {target_schema} schema")
             
@@ -626,7 +669,7 @@ def train_ml_model(**context) -> Dict[str, Any]:
             database_stored = False
         
         # Calculate total processing time
-        processing_time_ms = int((time.time() - start_time) * 1000)
+        processing_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
         
         # Complete results with all ML pipeline steps
         results = {
@@ -10,13 +10,28 @@ Created: 2025-08-17
 
 import logging
 import os
+import threading
+import time
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime, date, timedelta
-from typing import Dict, Any, Tuple
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Union
 from airflow.models import DagRun
 from airflow.utils.log.logging_mixin import LoggingMixin
 
 from .polish_trading_calendar import polish_calendar
 
+# Log directories already created by this process
+_ensured_dirs: set[str] = set()
+
+# Guards one-time handler installation per logger name
+_logger_lock = threading.Lock()
+_configured: set[str] = set()
+
+# Backfill date range bounds
+_MIN_BACKFILL_DATE = date(1990, 1, 1)
+_MAX_RANGE_DAYS = 3650  # 10 years
+
 
 class ETLLogger(LoggingMixin):
     """Enhanced logger for ETL operations with file and console output."""
@@ -32,16 +47,21 @@ class ETLLogger(LoggingMixin):
         self.log_dir = log_dir
         self.logger_name = name
         
-        # Ensure log directory exists
-        os.makedirs(log_dir, exist_ok=True)
+        # Ensure log directory exists (once per process)
+        if log_dir not in _ensured_dirs:
+            os.makedirs(log_dir, exist_ok=True)
+            _ensured_dirs.add(log_dir)
         
         # Create logger
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
         
-        # Prevent duplicate handlers
-        if not self.logger.handlers:
-            self._setup_handlers()
+        # Prevent duplicate handlers (concurrent task startup safe)
+        with _logger_lock:
+            if name not in _configured:
+                if not self.logger.handlers:
+                    self._setup_handlers()
+                _configured.add(name)
     
     def _setup_handlers(self):
         """Setup file and console handlers."""
@@ -73,12 +93,78 @@ class ETLLogger(LoggingMixin):
         return self.logger
 
 
-def determine_execution_mode(context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+@dataclass(slots=True)
+class ParsedContext:
+    """Values extracted once from an Airflow task context."""
+    
+    dag_run: Optional[DagRun]
+    conf: Dict[str, Any]
+    execution_date: Optional[str]
+    params: Dict[str, Any]
+
+
+def parse_dag_context(context: Union[Dict[str, Any], ParsedContext]) -> ParsedContext:
+    """
+    Extract DAG run, run configuration, execution date and params from context.
+    
+    Args:
+        context: Airflow task context (an already parsed context is returned as-is)
+        
+    Returns:
+        ParsedContext with the commonly used context values
+    """
+    if isinstance(context, ParsedContext):
+        return context
+    
+    dag_run = context.get('dag_run')
+    
+    # String format YYYY-MM-DD, falling back to logical_date when ds is missing
+    execution_date = context.get('ds')
+    if not execution_date:
+        logical_date = context.get('logical_date')
+        if logical_date:
+            execution_date = logical_date.strftime('%Y-%m-%d')
+    
+    return ParsedContext(
+        dag_run=dag_run,
+        conf=dag_run.conf if dag_run and dag_run.conf else {},
+        execution_date=execution_date,
+        params=context.get('params', {})
+    )
+
+
+@dataclass(slots=True)
+class ExecutionConfig:
+    """Execution configuration resolved for a single DAG run."""
+    
+    mode: str
+    execution_date: str
+    execution_date_obj: date
+    target_date: date
+    today: date
+    dag_run_type: str
+    is_trading_day: bool
+    reason: str
+    manual_conf: Dict[str, Any]
+    date_range: str
+    batch_size: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict (e.g. for XCom serialization)."""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExecutionConfig':
+        """Rebuild from a dict produced by to_dict (e.g. pulled from XCom)."""
+        return cls(**{f.name: data[f.name] for f in fields(cls)})
+
+
+def determine_execution_mode(context: Union[Dict[str, Any], ParsedContext]) -> Tuple[str, ExecutionConfig]:
     """
     Determine if this is a backfill or incremental execution.
     
     Args:
-        context: Airflow task context
+        context: Airflow task context or ParsedContext
         
     Returns:
         Tuple of (mode, config) where mode is 'backfill' or 'incremental'
@@ -86,23 +172,20 @@ def determine_execution_mode(context: Dict[str, Any]) -> Tuple[str, Dict[str, An
     logger = logging.getLogger(__name__)
     
     # Get execution context with safe access
-    dag_run: DagRun = context.get('dag_run')
-    execution_date = context.get('ds')  # String format YYYY-MM-DD
+    parsed = parse_dag_context(context)
+    dag_run: DagRun = parsed.dag_run
+    execution_date = parsed.execution_date
     
-    # Handle missing ds context (fallback to logical_date or today)
+    # Handle missing ds/logical_date context (fallback to today)
     if not execution_date:
-        logical_date = context.get('logical_date')
-        if logical_date:
-            execution_date = logical_date.strftime('%Y-%m-%d')
-        else:
-            execution_date = date.today().strftime('%Y-%m-%d')
-            logger.warning(f"No execution date in context, using today: {execution_date}")
+        execution_date = date.today().strftime('%Y-%m-%d')
+        logger.warning(f"No execution date in context, using today: {execution_date}")
     
     execution_dt = datetime.strptime(execution_date, '%Y-%m-%d').date()
     today = date.today()
     
     # Get DAG run configuration
-    conf = dag_run.conf if dag_run and dag_run.conf else {}
+    conf = parsed.conf
     
     # Mode determination logic
     mode = 'incremental'  # Default
@@ -128,38 +211,41 @@ def determine_execution_mode(context: Dict[str, Any]) -> Tuple[str, Dict[str, An
         mode = 'backfill'
         reason = 'Airflow catchup/backfill run'
     
-    # Build configuration
-    config = {
-        'mode': mode,
-        'execution_date': execution_date,
-        'execution_date_obj': execution_dt,
-        'today': today,
-        'dag_run_type': dag_run.run_type if dag_run else 'unknown',
-        'is_trading_day': polish_calendar.is_trading_day(execution_dt),
-        'reason': reason,
-        'manual_conf': conf
-    }
-    
     # Add mode-specific configuration
     if mode == 'backfill':
         # For backfill, process the exact execution date
-        config['target_date'] = execution_dt
-        config['date_range'] = conf.get('date_range', 'single_day')
-        config['batch_size'] = conf.get('batch_size', 30)
+        target_date = execution_dt
+        date_range = conf.get('date_range', 'single_day')
+        batch_size = conf.get('batch_size', 30)
     else:
         # For incremental, process previous trading day
-        config['target_date'] = polish_calendar.get_previous_trading_day(today)
-        config['date_range'] = 'single_day'
-        config['batch_size'] = 1
+        target_date = polish_calendar.get_previous_trading_day(today)
+        date_range = 'single_day'
+        batch_size = 1
+    
+    # Build configuration
+    config = ExecutionConfig(
+        mode=mode,
+        execution_date=execution_date,
+        execution_date_obj=execution_dt,
+        target_date=target_date,
+        today=today,
+        dag_run_type=dag_run.run_type if dag_run else 'unknown',
+        is_trading_day=polish_calendar.is_trading_day(execution_dt),
+        reason=reason,
+        manual_conf=conf,
+        date_range=date_range,
+        batch_size=batch_size
+    )
     
     logger.info(f"Execution mode determined: {mode} ({reason})")
-    logger.info(f"Target date for processing: {config['target_date']}")
-    logger.info(f"Is trading day: {config['is_trading_day']}")
+    logger.info(f"Target date for processing: {config.target_date}")
+    logger.info(f"Is trading day: {config.is_trading_day}")
     
     return mode, config
 
 
-def should_skip_execution(config: Dict[str, Any]) -> Tuple[bool, str]:
+def should_skip_execution(config: ExecutionConfig) -> Tuple[bool, str]:
     """
     Determine if execution should be skipped based on trading calendar.
     
@@ -169,8 +255,8 @@ def should_skip_execution(config: Dict[str, Any]) -> Tuple[bool, str]:
     Returns:
         Tuple of (should_skip, reason)
     """
-    target_date = config['target_date']
-    mode = config['mode']
+    target_date = config.target_date
+    mode = config.mode
     
     # For backfill mode, we might want to process even non-trading days
     # to ensure complete historical coverage
@@ -194,32 +280,28 @@ def should_skip_execution(config: Dict[str, Any]) -> Tuple[bool, str]:
     return False, f"Trading day: proceeding with {target_date}"
 
 
-def get_schema_from_context(context: Dict[str, Any], default: str = 'prod_stock_data') -> str:
+def get_schema_from_context(context: Union[Dict[str, Any], ParsedContext],
+                            default: str = 'prod_stock_data') -> str:
     """
     Get target schema from DAG context or configuration.
     
     Args:
-        context: Airflow task context
+        context: Airflow task context or ParsedContext
         default: Default schema if none specified
         
     Returns:
         Target schema name
     """
-    dag_run = context.get('dag_run')
-    conf = dag_run.conf if dag_run and dag_run.conf else {}
+    parsed = parse_dag_context(context)
     
     # Check various sources for schema
-    schema = (
-        conf.get('schema') or 
-        context.get('params', {}).get('schema') or
-        os.environ.get('ETL_TARGET_SCHEMA') or
-        default
-    )
-    
-    return schema
+    return (parsed.conf.get('schema') or
+            parsed.params.get('schema') or
+            os.environ.get('ETL_TARGET_SCHEMA') or
+            default)
 
 
-def log_execution_summary(config: Dict[str, Any], results: Dict[str, Any]):
+def log_execution_summary(config: ExecutionConfig, results: Dict[str, Any]):
     """
     Log a summary of execution results.
     
@@ -232,8 +314,8 @@ def log_execution_summary(config: Dict[str, Any], results: Dict[str, Any]):
     logger.info("=" * 60)
     logger.info("EXECUTION SUMMARY")
     logger.info("=" * 60)
-    logger.info(f"Mode: {config['mode']}")
-    logger.info(f"Target Date: {config['target_date']}")
+    logger.info(f"Mode: {config.mode}")
+    logger.info(f"Target Date: {config.target_date}")
     logger.info(f"Schema: {results.get('schema', 'unknown')}")
     logger.info(f"Records Processed: {results.get('total_processed', 0)}")
     logger.info(f"Records Inserted: {results.get('total_inserted', 0)}")
@@ -243,6 +325,17 @@ def log_execution_summary(config: Dict[str, Any], results: Dict[str, Any]):
     logger.info("=" * 60)
 
 
+@lru_cache(maxsize=1)
+def _today_for_minute(minute_bucket: int) -> date:
+    """Return today's date; cached per wall-clock minute bucket."""
+    return date.today()
+
+
+def _cached_today() -> date:
+    """Get today's date with a 60-second cache."""
+    return _today_for_minute(int(time.time() // 60))
+
+
 def validate_date_range(start_date: str, end_date: str) -> Tuple[bool, str]:
     """
     Validate a date range for backfill operations.
@@ -255,27 +348,25 @@ def validate_date_range(start_date: str, end_date: str) -> Tuple[bool, str]:
         Tuple of (is_valid, error_message)
     """
     try:
-        start_dt = datetime.strptime(start_date, '%Y-%m-%d').date()
-        end_dt = datetime.strptime(end_date, '%Y-%m-%d').date()
+        start_dt = date.fromisoformat(start_date)
+        end_dt = date.fromisoformat(end_date)
         
         # Validate range
         if start_dt > end_dt:
             return False, "Start date must be before end date"
         
         # Validate against reasonable bounds
-        min_date = date(1990, 1, 1)
-        max_date = date.today()
-        
-        if start_dt < min_date:
-            return False, f"Start date cannot be before {min_date}"
+        if start_dt < _MIN_BACKFILL_DATE:
+            return False, f"Start date cannot be before {_MIN_BACKFILL_DATE}"
         
+        max_date = _cached_today()
         if end_dt > max_date:
             return False, f"End date cannot be after {max_date}"
         
         # Check for reasonable range size (prevent accidentally huge backfills)
         days_diff = (end_dt - start_dt).days
-        if days_diff > 3650:  # 10 years
-            return False, f"Date range too large: {days_diff} days (max 3650)"
+        if days_diff > _MAX_RANGE_DAYS:
+            return False, f"Date range too large: {days_diff} days (max {_MAX_RANGE_DAYS})"
         
         return True, "Valid date range"
         
@@ -13,9 +13,54 @@ Author: Stock ETL Pipeline
 Created: 2025-08-17
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
-from typing import Set, List
+from typing import Set, List, Tuple
 import holidays
+import numpy as np
+
+# Optional JIT compilation for the trading-day scan (falls back to NumPy)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def _enumerate_trading_days(bitmap, start, end):
+    """
+    Collect offsets of trading days from a trading-day bitmap.
+    
+    Args:
+        bitmap: np.uint8 array with 1 for trading days, 0 otherwise
+        start: First offset to scan (inclusive)
+        end: Last offset to scan (exclusive)
+        
+    Returns:
+        np.int64 array of offsets within [start, end) that are trading days
+    """
+    out = np.empty(end - start, np.int64)
+    n = 0
+    for i in range(start, end):
+        if bitmap[i]:
+            out[n] = i
+            n += 1
+    return out[:n]
+
+
+def _trading_day_offsets(bitmap: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Dispatch the bitmap scan to the compiled kernel or a NumPy equivalent."""
+    if NUMBA_AVAILABLE:
+        return _enumerate_trading_days(bitmap, start, end)
+    return np.flatnonzero(bitmap[start:end]) + start
 
 
 class PolishTradingCalendar:
@@ -33,10 +78,23 @@ class PolishTradingCalendar:
             years = list(range(1990, 2031))
         
         self.years = years
-        self.polish_holidays = holidays.Poland(years=years)
+        
+        # Holidays are materialized for the whole span of configured years; dates
+        # outside it are still answered by the lazily expanding holiday rules
+        self._covered_years = frozenset(range(min(years), max(years) + 1))
+        self.polish_holidays = holidays.Poland(years=sorted(self._covered_years))
         
         # Additional WSE-specific closures (if any)
         self.custom_closures = self._get_custom_market_closures()
+        
+        # Union of all non-weekend closures in the covered years for single-lookup checks
+        self._closed_days: frozenset[date] = frozenset(self.polish_holidays) | self.custom_closures
+        
+        # Precomputed trading-day bitmap covering all configured years
+        self._bitmap_origin = date(min(years), 1, 1)
+        self._trading_bitmap = self._build_trading_bitmap(
+            self._bitmap_origin, date(max(years), 12, 31)
+        )
     
     def _get_custom_market_closures(self) -> Set[date]:
         """
@@ -55,6 +113,28 @@ class PolishTradingCalendar:
         
         return custom_closures
     
+    def _build_trading_bitmap(self, first_day: date, last_day: date) -> np.ndarray:
+        """
+        Build a uint8 bitmap with one entry per calendar day (1 = trading day).
+        
+        Args:
+            first_day: Date mapped to offset 0
+            last_day: Last date covered by the bitmap (inclusive)
+            
+        Returns:
+            Bitmap indexed by day offset from first_day
+        """
+        num_days = (last_day - first_day).days + 1
+        weekdays = (np.arange(num_days) + first_day.weekday()) % 7
+        bitmap = (weekdays < 5).astype(np.uint8)
+        
+        for closed_day in self._closed_days:
+            offset = (closed_day - first_day).days
+            if 0 <= offset < num_days:
+                bitmap[offset] = 0
+        
+        return bitmap
+    
     def is_trading_day(self, check_date: date) -> bool:
         """
         Check if a given date is a trading day.
@@ -65,19 +145,14 @@ class PolishTradingCalendar:
         Returns:
             True if it's a trading day, False otherwise
         """
-        # Check if it's a weekend
-        if check_date.weekday() >= 5:  # Saturday=5, Sunday=6
+        # Weekdays (Saturday=5, Sunday=6 excluded) that are not holidays/closures
+        if check_date.weekday() >= 5:
             return False
+        if check_date.year in self._covered_years:
+            return check_date not in self._closed_days
         
-        # Check if it's a Polish public holiday
-        if check_date in self.polish_holidays:
-            return False
-        
-        # Check custom market closures
-        if check_date in self.custom_closures:
-            return False
-        
-        return True
+        # Outside the configured years: the holiday rules expand to this year on lookup
+        return check_date not in self.polish_holidays and check_date not in self.custom_closures
     
     def get_trading_days_in_range(self, start_date: date, end_date: date) -> List[date]:
         """
@@ -90,6 +165,17 @@ class PolishTradingCalendar:
         Returns:
             List of trading days in the range
         """
+        if start_date > end_date:
+            return []
+        
+        start_idx = (start_date - self._bitmap_origin).days
+        end_idx = (end_date - self._bitmap_origin).days + 1
+        
+        # Fast path: range fully covered by the precomputed bitmap
+        if start_idx >= 0 and end_idx <= len(self._trading_bitmap):
+            offsets = _trading_day_offsets(self._trading_bitmap, start_idx, end_idx)
+            return [self._bitmap_origin + timedelta(days=int(o)) for o in offsets]
+        
         trading_days = []
         current_date = start_date
         
@@ -100,6 +186,28 @@ class PolishTradingCalendar:
         
         return trading_days
     
+    def get_trading_days_in_ranges(self, ranges: List[Tuple[date, date]]) -> List[List[date]]:
+        """
+        Get trading days for many date ranges in parallel (e.g. large backfills).
+        
+        The trading bitmap is read-only after initialization, so ranges are
+        enumerated concurrently on a thread pool.
+        
+        Args:
+            ranges: List of (start_date, end_date) tuples
+            
+        Returns:
+            List of trading-day lists, in the same order as ranges
+        """
+        if len(ranges) <= 1:
+            return [self.get_trading_days_in_range(start, end) for start, end in ranges]
+        
+        starts = [start for start, _ in ranges]
+        ends = [end for _, end in ranges]
+        
+        with ThreadPoolExecutor(max_workers=min(len(ranges), os.cpu_count() or 1)) as executor:
+            return list(executor.map(self.get_trading_days_in_range, starts, ends))
+    
     def get_previous_trading_day(self, reference_date: date = None) -> date:
         """
         Get the previous trading day before the reference date.
@@ -195,8 +303,9 @@ class PolishTradingCalendar:
         Returns:
             Holiday name if it's a holiday, empty string otherwise
         """
-        if check_date in self.polish_holidays:
-            return self.polish_holidays[check_date]
+        holiday_name = self.polish_holidays.get(check_date, "")
+        if holiday_name:
+            return holiday_name
         elif check_date in self.custom_closures:
             return "Market Closure"
         else:
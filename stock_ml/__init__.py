@@ -3,14 +3,23 @@ Stock Growth Classification ML Pipeline
 
 A comprehensive machine learning pipeline for predicting stock growth using XGBoost classification.
 Includes data extraction, feature engineering, model training, and backtesting capabilities.
+
+Public classes are imported lazily on first access, so importing a single submodule
+(e.g. stock_ml.database_operations) does not pull in sklearn/xgboost/psycopg2.
 """
 
-from .data_extractor import MultiStockDataExtractor
-from .feature_engineering import StockFeatureEngineer
-from .preprocessing import XGBoostPreprocessor
-from .model_trainer_optimized import XGBoostTrainer, MultiStockXGBoostTrainer, HighPerformanceXGBoostTrainer
-from .backtesting import TradingBacktester
+import importlib
+
 # Note: complete_pipeline moved to .temp - using test_pipeline as main reference
+_LAZY_IMPORTS = {
+    'MultiStockDataExtractor': '.data_extractor',
+    'StockFeatureEngineer': '.feature_engineering',
+    'XGBoostPreprocessor': '.preprocessing',
+    'XGBoostTrainer': '.model_trainer_optimized',
+    'MultiStockXGBoostTrainer': '.model_trainer_optimized',
+    'HighPerformanceXGBoostTrainer': '.model_trainer_optimized',
+    'TradingBacktester': '.backtesting',
+}
 
 __version__ = "1.0.0"
 __author__ = "Stock ML Pipeline"
@@ -23,4 +32,18 @@ __all__ = [
     'HighPerformanceXGBoostTrainer',
     'MultiStockXGBoostTrainer',
     'TradingBacktester'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Import public classes on first access (PEP 562)"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -8,6 +8,8 @@ import numpy as np
 import logging
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
+from joblib import Parallel, delayed
+from numpy.lib.stride_tricks import sliding_window_view
 # Optional visualization imports (for Airflow DAG compatibility)
 try:
     import matplotlib.pyplot as plt
@@ -20,10 +22,228 @@ from pathlib import Path
 # Set up logging using centralized configuration
 try:
     from .logging_config import get_ml_logger
+    from .jit_utils import njit, NUMBA_AVAILABLE
 except ImportError:
     from logging_config import get_ml_logger
+    from jit_utils import njit, NUMBA_AVAILABLE
 logger = get_ml_logger(__name__)
 
+# Trade action codes used by the compiled simulation kernel
+ACTION_BUY = 0
+ACTION_SELL = 1
+ACTION_CLOSE = 2  # Forced exit of an open position at the end of the test period
+ACTION_NAMES = {ACTION_BUY: 'BUY', ACTION_SELL: 'SELL', ACTION_CLOSE: 'SELL'}
+
+
+@njit(cache=True, nogil=True, fastmath=True, boundscheck=False)
+def _simulate(prices, signal, initial_capital, position_size, tx_cost,
+              bar_index, action, price_out, shares_out, cost_out, proceeds_out,
+              capital_after, trade_return, portfolio_values):
+    """
+    Run the long-only trading state machine over the test period.
+    
+    signal holds the precomputed buy signal per bar (1 = probability above threshold).
+    Trades are evaluated for all bars except the last 7 (forward-return buffer);
+    an open position is closed on the last evaluated bar. Trades are written
+    into the preallocated columnar buffers and portfolio values per bar into
+    portfolio_values (length n_sim + 1). Drawdown and the non-zero per-bar
+    portfolio return statistics (Welford) are accumulated in the same pass.
+    
+    Returns:
+        Tuple of (n_trades, max_drawdown, ret_mean, ret_m2, ret_count)
+    """
+    n_sim = portfolio_values.shape[0] - 1
+    
+    capital = initial_capital
+    position = 0
+    entry_price = 0.0
+    k = 0
+    portfolio_values[0] = capital
+    
+    # Path statistics
+    running_max = capital
+    min_drawdown = 0.0
+    ret_count = 0
+    ret_mean = 0.0
+    ret_m2 = 0.0
+    
+    for i in range(n_sim):
+        price = prices[i]
+        should_buy = signal[i] != 0
+        
+        if should_buy and position == 0:
+            shares_to_buy = int((capital * position_size) / price)
+            if shares_to_buy > 0:
+                cost = shares_to_buy * price * (1 + tx_cost)
+                if cost <= capital:
+                    capital -= cost
+                    position = shares_to_buy
+                    entry_price = price
+                    bar_index[k] = i
+                    action[k] = ACTION_BUY
+                    price_out[k] = price
+                    shares_out[k] = shares_to_buy
+                    cost_out[k] = cost
+                    capital_after[k] = capital
+                    k += 1
+        elif not should_buy and position > 0:
+            proceeds = position * price * (1 - tx_cost)
+            capital += proceeds
+            bar_index[k] = i
+            action[k] = ACTION_SELL
+            price_out[k] = price
+            shares_out[k] = position
+            proceeds_out[k] = proceeds
+            capital_after[k] = capital
+            trade_return[k] = (price - entry_price) / entry_price
+            k += 1
+            position = 0
+            entry_price = 0.0
+        
+        portfolio_value = capital + position * price
+        portfolio_values[i + 1] = portfolio_value
+        
+        # Running max / drawdown
+        if portfolio_value > running_max:
+            running_max = portfolio_value
+        drawdown = (portfolio_value - running_max) / running_max
+        if drawdown < min_drawdown:
+            min_drawdown = drawdown
+        
+        # Welford update on non-zero portfolio returns (divide only when the value changed)
+        prev_value = portfolio_values[i]
+        value_change = portfolio_value - prev_value
+        if value_change != 0.0:
+            period_return = value_change / prev_value
+            ret_count += 1
+            delta = period_return - ret_mean
+            ret_mean += delta / ret_count
+            ret_m2 += delta * (period_return - ret_mean)
+    
+    # Close final position if open
+    if position > 0:
+        i = n_sim - 1
+        price = prices[i]
+        proceeds = position * price * (1 - tx_cost)
+        capital += proceeds
+        bar_index[k] = i
+        action[k] = ACTION_CLOSE
+        price_out[k] = price
+        shares_out[k] = position
+        proceeds_out[k] = proceeds
+        capital_after[k] = capital
+        trade_return[k] = (price - entry_price) / entry_price
+        k += 1
+    
+    return k, -min_drawdown, ret_mean, ret_m2, ret_count
+
+
+def _simulate_runs(prices, signal, initial_capital, position_size, tx_cost,
+                   bar_index, action, price_out, shares_out, cost_out, proceeds_out,
+                   capital_after, trade_return, portfolio_values):
+    """
+    NumPy equivalent of _simulate used when numba is not installed.
+    
+    Iterates signal runs (rising to falling edge) instead of every bar, then
+    derives the portfolio curve and path statistics from cumulative cash and
+    share changes. Same arguments and return value as _simulate.
+    """
+    n_sim = portfolio_values.shape[0] - 1
+    active = signal[:n_sim] != 0
+    
+    # Rising edges open a signal run, falling edges close it
+    edges = np.diff(active.astype(np.int8), prepend=np.int8(0))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    
+    # Cash and share changes per bar (non-zero only at trade events)
+    cash_delta = np.zeros(n_sim)
+    shares_delta = np.zeros(n_sim)
+    
+    capital = initial_capital
+    position = 0
+    entry_price = 0.0
+    k = 0
+    
+    for r, run_start in enumerate(run_starts):
+        run_end = run_ends[r] if r < len(run_ends) else n_sim
+        
+        # Enter on the first bar of the run where the position is affordable
+        for i in range(run_start, run_end):
+            price = prices[i]
+            shares_to_buy = int((capital * position_size) / price)
+            if shares_to_buy > 0:
+                cost = shares_to_buy * price * (1 + tx_cost)
+                if cost <= capital:
+                    capital -= cost
+                    position = shares_to_buy
+                    entry_price = price
+                    cash_delta[i] -= cost
+                    shares_delta[i] += shares_to_buy
+                    bar_index[k] = i
+                    action[k] = ACTION_BUY
+                    price_out[k] = price
+                    shares_out[k] = shares_to_buy
+                    cost_out[k] = cost
+                    capital_after[k] = capital
+                    k += 1
+                    break
+        
+        # Exit when the signal drops
+        if position > 0 and run_end < n_sim:
+            price = prices[run_end]
+            proceeds = position * price * (1 - tx_cost)
+            capital += proceeds
+            cash_delta[run_end] += proceeds
+            shares_delta[run_end] -= position
+            bar_index[k] = run_end
+            action[k] = ACTION_SELL
+            price_out[k] = price
+            shares_out[k] = position
+            proceeds_out[k] = proceeds
+            capital_after[k] = capital
+            trade_return[k] = (price - entry_price) / entry_price
+            k += 1
+            position = 0
+            entry_price = 0.0
+    
+    # Portfolio value per bar from the cumulative cash and share curves
+    portfolio_values[0] = initial_capital
+    portfolio_values[1:] = (initial_capital + np.cumsum(cash_delta)
+                            + np.cumsum(shares_delta) * prices[:n_sim])
+    
+    # Close final position if open
+    if position > 0:
+        i = n_sim - 1
+        price = prices[i]
+        proceeds = position * price * (1 - tx_cost)
+        capital += proceeds
+        bar_index[k] = i
+        action[k] = ACTION_CLOSE
+        price_out[k] = price
+        shares_out[k] = position
+        proceeds_out[k] = proceeds
+        capital_after[k] = capital
+        trade_return[k] = (price - entry_price) / entry_price
+        k += 1
+    
+    # Path statistics: drawdown from the running max, moments of non-zero returns
+    running_max = np.maximum.accumulate(portfolio_values)
+    max_drawdown = -min(float(((portfolio_values - running_max) / running_max).min()), 0.0)
+    value_change = np.diff(portfolio_values)
+    changed = value_change != 0.0
+    period_returns = value_change[changed] / portfolio_values[:-1][changed]
+    ret_count = len(period_returns)
+    ret_mean = float(period_returns.mean()) if ret_count else 0.0
+    ret_m2 = float(((period_returns - ret_mean) ** 2).sum())
+    
+    return k, max_drawdown, ret_mean, ret_m2, ret_count
+
+
+# Compiled state machine when numba is installed, signal-run NumPy path otherwise
+_simulate_backtest = _simulate if NUMBA_AVAILABLE else _simulate_runs
+
+
 def find_project_root() -> Path:
     """Find project root by looking for CLAUDE.md"""
     current_path = Path(__file__).parent
@@ -65,6 +285,10 @@ def document_backtest_results(backtest_data: Dict[str, Any], symbol: str) -> Non
         
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
+        # Trade history frame, built once for both documents
+        trades = backtest_data.get('trades')
+        trades_df = pd.DataFrame(trades) if trades else None
+        
         # Create markdown content
         step_name = backtest_data.get('step_name', 'BACKTESTING')
         step_desc = backtest_data.get('step_description', 'Trading strategy backtesting performance summary')
@@ -113,8 +337,7 @@ def document_backtest_results(backtest_data: Dict[str, Any], symbol: str) -> Non
         md_content += summary_df.to_markdown(index=False, floatfmt=".4f")
         
         # Document trade history if available
-        if 'trades' in backtest_data and backtest_data['trades']:
-            trades_df = pd.DataFrame(backtest_data['trades'])
+        if trades_df is not None:
             md_content += f"""
 
 ## Trade History Sample (First 5 Trades)
@@ -192,15 +415,12 @@ CREATE TABLE ml_trades (
         filename = f"step07_backtest_results_{symbol.lower()}.md"
         file_path = docs_dir / filename
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(md_content)
+        file_path.write_text(md_content, encoding='utf-8')
             
         print(f"📋 Documented backtest results: {file_path}")
         
         # Also document trade history separately if significant
-        if 'trades' in backtest_data and backtest_data['trades'] and len(backtest_data['trades']) > 0:
-            trades_df = pd.DataFrame(backtest_data['trades'])
-            
+        if trades_df is not None:
             # Create separate trade history documentation
             trade_md_content = f"""# STEP 7 - BACKTESTING - Trade History DataFrame Schema
 
@@ -236,8 +456,7 @@ CREATE TABLE ml_trades (
             trade_filename = f"step07_trade_history_{symbol.lower()}.md"
             trade_file_path = docs_dir / trade_filename
             
-            with open(trade_file_path, 'w', encoding='utf-8') as f:
-                f.write(trade_md_content)
+            trade_file_path.write_text(trade_md_content, encoding='utf-8')
                 
             print(f"📋 Documented trade history: {trade_file_path}")
             
@@ -263,156 +482,157 @@ class TradingBacktester:
         self.transaction_cost = transaction_cost
         self.position_size = position_size
         self.backtest_results = {}
+        self._portfolio_summary = None  # Summary of backtest_results, reset when results change
         
     def backtest_single_stock(self, test_df: pd.DataFrame, 
-                            predictions: np.ndarray, 
-                            probabilities: np.ndarray,
+                            predictions: Optional[np.ndarray] = None, 
+                            probabilities: Optional[np.ndarray] = None,
                             symbol: str = "",
-                            prediction_threshold: float = 0.5,
+                            prediction_threshold: Optional[float] = None,
                             probability_threshold: float = 0.6) -> Dict[str, Any]:
         """
         Backtest trading strategy for a single stock
         
         Args:
             test_df: Test DataFrame with price data
-            predictions: Model predictions (0/1)
-            probabilities: Model probabilities [0,1]
+            predictions: Model predictions (0/1); unused, kept for backward compatibility
+            probabilities: Model probabilities [0,1] (required, drives all trading decisions)
             symbol: Stock symbol
-            prediction_threshold: Threshold for binary predictions (not used if using probabilities)
+            prediction_threshold: Unused, kept for backward compatibility
             probability_threshold: Threshold for probability-based trading
             
         Returns:
             Backtesting results dictionary
         """
+        if probabilities is None:
+            raise ValueError("probabilities are required for backtesting")
+        
         logger.info(f"{symbol}: Starting backtest with {len(test_df)} periods...")
         
-        # Ensure we have the same number of rows
-        min_len = min(len(test_df), len(predictions), len(probabilities))
-        test_df = test_df.iloc[-min_len:].copy().reset_index(drop=True)
-        predictions = predictions[-min_len:]
+        # Ensure we have the same number of rows (extract only the columns used, no frame copy)
+        min_len = min(len(test_df), len(probabilities))
+        dates = test_df['trading_date_local'].to_numpy()[-min_len:]
+        prices = test_df['close_price'].to_numpy(dtype=np.float64)[-min_len:]
         probabilities = probabilities[-min_len:]
         
-        # Initialize tracking variables
-        capital = self.initial_capital
-        position = 0  # 0 = no position, 1 = long position
-        entry_price = 0
-        trades = []
-        portfolio_values = [capital]
-        cash_values = [capital]
+        # Trading signal for every bar in one vectorized compare
+        signal = (np.asarray(probabilities) > probability_threshold).view(np.uint8)
         
-        # Get actual future returns
+        # Get actual future returns, plus the bars with a known return for signal scoring
         if 'growth_future_7d' in test_df.columns:
-            actual_returns = test_df['growth_future_7d'].values - 1
+            actual_returns = test_df['growth_future_7d'].to_numpy(dtype=np.float64)[-min_len:] - 1
+            scored = ~np.isnan(actual_returns)
+            scored_probabilities = probabilities[scored]
+            scored_returns = actual_returns[scored]
         else:
             # Calculate 7-day forward returns if not available
-            prices = test_df['close_price'].values
             actual_returns = np.full(len(prices), np.nan)
-            for i in range(len(prices) - 7):
-                if i + 7 < len(prices):
-                    actual_returns[i] = (prices[i + 7] / prices[i]) - 1
-        
-        dates = test_df['trading_date_local'].values
-        prices = test_df['close_price'].values
-        
-        # Trading simulation
-        for i in range(len(test_df) - 7):  # Leave buffer for 7-day returns
-            current_date = dates[i]
-            current_price = prices[i]
-            model_probability = probabilities[i]
-            actual_return = actual_returns[i]
-            
-            # Trading decision based on probability threshold
-            should_buy = model_probability > probability_threshold
-            
-            # Execute trading logic
-            if should_buy and position == 0:
-                # Enter long position
-                shares_to_buy = int((capital * self.position_size) / current_price)
-                if shares_to_buy > 0:
-                    cost = shares_to_buy * current_price * (1 + self.transaction_cost)
-                    if cost <= capital:
-                        capital -= cost
-                        position = shares_to_buy
-                        entry_price = current_price
-                        
-                        trades.append({
-                            'date': current_date,
-                            'action': 'BUY',
-                            'price': current_price,
-                            'shares': shares_to_buy,
-                            'cost': cost,
-                            'capital_after': capital,
-                            'model_probability': model_probability,
-                            'actual_return': actual_return
-                        })
-                        
-            elif not should_buy and position > 0:
-                # Exit long position
-                proceeds = position * current_price * (1 - self.transaction_cost)
-                capital += proceeds
-                
-                # Calculate trade return
-                trade_return = (current_price - entry_price) / entry_price
-                
-                trades.append({
-                    'date': current_date,
-                    'action': 'SELL',
-                    'price': current_price,
-                    'shares': position,
-                    'proceeds': proceeds,
-                    'capital_after': capital,
-                    'trade_return': trade_return,
-                    'model_probability': model_probability,
-                    'actual_return': actual_return
-                })
-                
-                position = 0
-                entry_price = 0
-                
-            # Calculate current portfolio value
-            if position > 0:
-                portfolio_value = capital + (position * current_price)
-            else:
-                portfolio_value = capital
-                
-            portfolio_values.append(portfolio_value)
-            cash_values.append(capital)
-            
-        # Close final position if open
-        if position > 0:
-            final_price = prices[-8]  # Use price 7 days before end
-            proceeds = position * final_price * (1 - self.transaction_cost)
-            capital += proceeds
-            trade_return = (final_price - entry_price) / entry_price
-            
-            trades.append({
-                'date': dates[-8],
-                'action': 'SELL',
-                'price': final_price,
-                'shares': position,
-                'proceeds': proceeds,
-                'capital_after': capital,
-                'trade_return': trade_return,
-                'model_probability': probabilities[-31],
-                'actual_return': actual_returns[-31] if not np.isnan(actual_returns[-31]) else 0
-            })
+            if len(prices) > 7:
+                # Last element of each 8-bar window is the price 7 bars ahead (zero-copy view)
+                future_prices = sliding_window_view(prices, window_shape=8)[:, -1]
+                np.divide(future_prices, prices[:-7], out=actual_returns[:-7])
+                actual_returns[:-7] -= 1.0
+            # Computed returns are NaN exactly on the last 7 bars, so no scan is needed
+            scored_probabilities = probabilities[:-7]
+            scored_returns = actual_returns[:-7]
+        
+        # Trading simulation (compiled kernel or NumPy fallback, writing into columnar trade buffers)
+        n_sim = max(len(prices) - 7, 0)  # Leave buffer for 7-day returns
+        buffers = self._alloc_trade_buffers(n_sim + 1)
+        portfolio_values = np.empty(n_sim + 1, dtype=np.float64)
+        n_trades, max_drawdown, ret_mean, ret_m2, ret_count = _simulate_backtest(
+            prices, signal,
+            float(self.initial_capital), float(self.position_size),
+            float(self.transaction_cost),
+            buffers['bar_index'], buffers['action'], buffers['price'],
+            buffers['shares'], buffers['cost'], buffers['proceeds'],
+            buffers['capital_after'], buffers['trade_return'], portfolio_values
+        )
+        trade_arrays = {name: buf[:n_trades] for name, buf in buffers.items()}
+        path_stats = {
+            'max_drawdown': max_drawdown,
+            'return_mean': ret_mean,
+            'return_m2': ret_m2,
+            'return_count': ret_count
+        }
+        
+        # Model inputs at each trade bar (forced close reports 0 for a missing forward return)
+        bar_index = trade_arrays['bar_index']
+        trade_arrays['model_probability'][:] = probabilities[bar_index]
+        trade_arrays['actual_return'][:] = actual_returns[bar_index]
+        close_mask = (trade_arrays['action'] == ACTION_CLOSE) & np.isnan(trade_arrays['actual_return'])
+        trade_arrays['actual_return'][close_mask] = 0
+        
+        trades = self._trade_records(trade_arrays, dates)
         
         # Calculate performance metrics
         results = self._calculate_performance_metrics(
-            trades, portfolio_values, test_df, symbol, probabilities, 
-            actual_returns, probability_threshold
+            trades, trade_arrays, portfolio_values, path_stats, prices, dates, symbol,
+            scored_probabilities, scored_returns, probability_threshold
         )
         
         # Store results
         self.backtest_results[symbol] = results
+        self._portfolio_summary = None
         
         logger.info(f"{symbol}: Backtest completed - Total return: {results['total_return']:.2%}, Sharpe ratio: {results['sharpe_ratio']:.3f}")
         
         return results
         
+    def _alloc_trade_buffers(self, n: int) -> Dict[str, np.ndarray]:
+        """
+        Allocate columnar (SoA) trade buffers for up to n trades
+        
+        Money columns stay float64 to keep compounding exact; per-trade ratios
+        (returns, probabilities) are reported to 0.01% and are stored as float32.
+        """
+        return {
+            'bar_index': np.empty(n, dtype=np.int64),
+            'action': np.empty(n, dtype=np.uint8),
+            'price': np.empty(n, dtype=np.float64),
+            'shares': np.empty(n, dtype=np.int64),
+            'cost': np.full(n, np.nan),
+            'proceeds': np.full(n, np.nan),
+            'capital_after': np.empty(n, dtype=np.float64),
+            'trade_return': np.full(n, np.nan, dtype=np.float32),
+            'model_probability': np.empty(n, dtype=np.float32),
+            'actual_return': np.empty(n, dtype=np.float32)
+        }
+        
+    def _trade_records(self, trade_arrays: Dict[str, np.ndarray], dates: np.ndarray) -> List[Dict]:
+        """Convert columnar trade arrays into per-trade records for reporting"""
+        
+        # Materialize trade dates with one gather over the integer bar indices
+        trade_dates = dates[trade_arrays['bar_index']]
+        
+        trades = []
+        for k in range(len(trade_arrays['action'])):
+            action = trade_arrays['action'][k]
+            record = {
+                'date': trade_dates[k],
+                'action': ACTION_NAMES[action],
+                'price': trade_arrays['price'][k],
+                'shares': int(trade_arrays['shares'][k])
+            }
+            if action == ACTION_BUY:
+                record['cost'] = trade_arrays['cost'][k]
+                record['capital_after'] = trade_arrays['capital_after'][k]
+            else:
+                record['proceeds'] = trade_arrays['proceeds'][k]
+                record['capital_after'] = trade_arrays['capital_after'][k]
+                record['trade_return'] = float(trade_arrays['trade_return'][k])
+            record['model_probability'] = float(trade_arrays['model_probability'][k])
+            record['actual_return'] = float(trade_arrays['actual_return'][k])
+            trades.append(record)
+        
+        return trades
+        
     def _calculate_performance_metrics(self, trades: List[Dict], 
-                                     portfolio_values: List[float],
-                                     test_df: pd.DataFrame,
+                                     trade_arrays: Dict[str, np.ndarray],
+                                     portfolio_values: np.ndarray,
+                                     path_stats: Dict[str, float],
+                                     prices: np.ndarray,
+                                     dates: np.ndarray,
                                      symbol: str,
                                      probabilities: np.ndarray,
                                      actual_returns: np.ndarray,
@@ -437,23 +657,13 @@ class TradingBacktester:
                 'error': 'No trades executed'
             }
         
-        # Convert trades to DataFrame for analysis
-        trades_df = pd.DataFrame(trades)
-        buy_trades = trades_df[trades_df['action'] == 'BUY']
-        sell_trades = trades_df[trades_df['action'] == 'SELL']
-        
         # Calculate returns
         final_value = portfolio_values[-1]
         total_return = (final_value - self.initial_capital) / self.initial_capital
         
-        # Calculate portfolio daily returns
-        portfolio_returns = np.diff(portfolio_values) / portfolio_values[:-1]
-        portfolio_returns = portfolio_returns[portfolio_returns != 0]  # Remove zero returns
-        
-        # Time period calculation
-        start_date = pd.to_datetime(test_df['trading_date_local'].iloc[0])
-        end_date = pd.to_datetime(test_df['trading_date_local'].iloc[-1])
-        years = (end_date - start_date).days / 365.25
+        # Time period calculation (whole days via datetime64[D] arithmetic)
+        days = (np.datetime64(dates[-1], 'D') - np.datetime64(dates[0], 'D')).astype(np.int64)
+        years = days / 365.25
         
         # Annualized return
         if years > 0:
@@ -461,27 +671,28 @@ class TradingBacktester:
         else:
             annualized_return = 0
             
-        # Volatility (annualized)
-        if len(portfolio_returns) > 1:
-            volatility = np.std(portfolio_returns) * np.sqrt(252)
+        # Volatility (annualized) from the kernel's Welford stats over non-zero daily returns
+        return_count = path_stats['return_count']
+        if return_count > 1:
+            volatility = np.sqrt(path_stats['return_m2'] / return_count) * np.sqrt(252)
         else:
             volatility = 0
             
         # Sharpe ratio (assuming risk-free rate = 0)
         sharpe_ratio = annualized_return / volatility if volatility > 0 else 0
         
-        # Max drawdown
-        running_max = np.maximum.accumulate(portfolio_values)
-        drawdowns = (np.array(portfolio_values) - running_max) / running_max
-        max_drawdown = abs(min(drawdowns))
-        
-        # Trade statistics
-        completed_trades = sell_trades[sell_trades['trade_return'].notna()]
-        if len(completed_trades) > 0:
-            trade_returns = completed_trades['trade_return'].values
-            winning_trades = len(trade_returns[trade_returns > 0])
-            win_rate = winning_trades / len(trade_returns)
-            avg_return_per_trade = np.mean(trade_returns)
+        # Max drawdown (tracked by the simulation kernel)
+        max_drawdown = path_stats['max_drawdown']
+        
+        # Trade statistics over completed exits (signal drops and end-of-period closes)
+        trade_return_arr = trade_arrays['trade_return']
+        completed_mask = (trade_arrays['action'] != ACTION_BUY) & ~np.isnan(trade_return_arr)
+        trade_returns = trade_return_arr[completed_mask]
+        completed_trades = len(trade_returns)
+        if completed_trades > 0:
+            winning_trades = int(np.count_nonzero(trade_returns > 0))
+            win_rate = winning_trades / completed_trades
+            avg_return_per_trade = float(trade_returns.mean(dtype=np.float64))
         else:
             winning_trades = 0
             win_rate = 0
@@ -493,10 +704,7 @@ class TradingBacktester:
         )
         
         # Buy and hold comparison
-        if 'close_price' in test_df.columns:
-            buy_hold_return = (test_df['close_price'].iloc[-31] / test_df['close_price'].iloc[0]) - 1
-        else:
-            buy_hold_return = 0
+        buy_hold_return = (prices[-31] / prices[0]) - 1
             
         return {
             'symbol': symbol,
@@ -505,7 +713,7 @@ class TradingBacktester:
             'sharpe_ratio': sharpe_ratio,
             'max_drawdown': max_drawdown,
             'volatility': volatility,
-            'total_trades': len(completed_trades),
+            'total_trades': completed_trades,
             'winning_trades': winning_trades,
             'win_rate': win_rate,
             'avg_return_per_trade': avg_return_per_trade,
@@ -522,29 +730,18 @@ class TradingBacktester:
     def _calculate_signal_accuracy(self, probabilities: np.ndarray, 
                                  actual_returns: np.ndarray, 
                                  threshold: float) -> Dict[str, float]:
-        """Calculate signal accuracy metrics"""
-        
-        # Remove NaN values
-        valid_mask = ~np.isnan(actual_returns)
-        valid_probs = probabilities[valid_mask]
-        valid_returns = actual_returns[valid_mask]
+        """Calculate signal accuracy metrics (inputs must already exclude bars without a known return)"""
         
-        if len(valid_returns) == 0:
+        if len(actual_returns) == 0:
             return {'precision': 0, 'recall': 0, 'accuracy': 0}
             
-        # Model signals
-        predicted_positive = valid_probs > threshold
-        actual_positive = valid_returns > 0
-        
-        # Calculate metrics
-        tp = np.sum(predicted_positive & actual_positive)
-        fp = np.sum(predicted_positive & ~actual_positive)
-        fn = np.sum(~predicted_positive & actual_positive)
-        tn = np.sum(~predicted_positive & ~actual_positive)
+        # Confusion matrix in one pass: code = 2 * predicted_positive + actual_positive
+        code = (probabilities > threshold).astype(np.uint8) * 2 + (actual_returns > 0).astype(np.uint8)
+        tn, fn, fp, tp = np.bincount(code, minlength=4)
         
         precision = tp / (tp + fp) if (tp + fp) > 0 else 0
         recall = tp / (tp + fn) if (tp + fn) > 0 else 0
-        accuracy = (tp + tn) / len(valid_returns)
+        accuracy = (tp + tn) / len(actual_returns)
         
         return {
             'precision': precision,
@@ -552,58 +749,79 @@ class TradingBacktester:
             'accuracy': accuracy
         }
         
+    def _backtest_symbol(self, symbol: str, symbol_results: Dict[str, Any],
+                         test_df: pd.DataFrame,
+                         probability_threshold: float) -> Optional[Dict[str, Any]]:
+        """Backtest and document a single symbol; returns None on failure"""
+        
+        try:
+            # Get model predictions and test data
+            model_results = symbol_results['test_results']
+            probabilities = model_results['test_probabilities']
+            
+            # Run backtest
+            backtest_result = self.backtest_single_stock(
+                test_df=test_df,
+                probabilities=probabilities,
+                symbol=symbol,
+                probability_threshold=probability_threshold
+            )
+            
+            # Document backtest results
+            backtest_result['step_name'] = 'STEP 7 - BACKTESTING'
+            backtest_result['step_description'] = 'Trading strategy backtesting results with performance metrics, risk analysis, and individual trade history'
+            document_backtest_results(backtest_result, symbol)
+            
+            return backtest_result
+            
+        except Exception as e:
+            logger.error(f"Failed to backtest {symbol}: {e}")
+            return None
+        
     def backtest_multiple_stocks(self, test_results: Dict[str, Dict[str, Any]],
                                 test_data: Dict[str, pd.DataFrame],
-                                probability_threshold: float = 0.6) -> Dict[str, Any]:
+                                probability_threshold: float = 0.6,
+                                n_jobs: int = -1) -> Dict[str, Any]:
         """
         Backtest multiple stocks
         
+        Symbols are backtested concurrently on a thread pool; the simulation
+        kernel releases the GIL, so threads avoid process pickling overhead.
+        
         Args:
             test_results: Dictionary of test results from model training
             test_data: Dictionary of test DataFrames
             probability_threshold: Probability threshold for trading signals
+            n_jobs: Number of parallel workers (-1 = all cores)
             
         Returns:
             Combined backtest results
         """
         logger.info(f"Starting backtest for {len(test_results)} stocks...")
         
-        individual_results = {}
-        
+        symbols = []
         for symbol in test_results.keys():
             if symbol not in test_data:
                 logger.warning(f"No test data found for {symbol}")
                 continue
+            symbols.append(symbol)
+            
+        symbol_results = Parallel(n_jobs=n_jobs, backend='threading')(
+            delayed(self._backtest_symbol)(
+                symbol, test_results[symbol], test_data[symbol], probability_threshold
+            )
+            for symbol in symbols
+        )
+        
+        individual_results = {
+            symbol: result for symbol, result in zip(symbols, symbol_results)
+            if result is not None
+        }
                 
-            try:
-                # Get model predictions and test data
-                model_results = test_results[symbol]['test_results']
-                predictions = model_results['test_predictions']
-                probabilities = model_results['test_probabilities']
-                test_df = test_data[symbol]
-                
-                # Run backtest
-                backtest_result = self.backtest_single_stock(
-                    test_df=test_df,
-                    predictions=predictions,
-                    probabilities=probabilities,
-                    symbol=symbol,
-                    probability_threshold=probability_threshold
-                )
-                
-                individual_results[symbol] = backtest_result
-                
-                # Document backtest results
-                backtest_result['step_name'] = 'STEP 7 - BACKTESTING'
-                backtest_result['step_description'] = 'Trading strategy backtesting results with performance metrics, risk analysis, and individual trade history'
-                document_backtest_results(backtest_result, symbol)
-                
-            except Exception as e:
-                logger.error(f"Failed to backtest {symbol}: {e}")
-                continue
-                
-        # Generate portfolio summary
+        # Generate portfolio summary (reused by the report when it covers all stored results)
         portfolio_summary = self._generate_portfolio_summary(individual_results)
+        if individual_results.keys() == self.backtest_results.keys():
+            self._portfolio_summary = portfolio_summary
         
         return {
             'individual_results': individual_results,
@@ -617,35 +835,56 @@ class TradingBacktester:
         if not individual_results:
             return {}
             
-        # Aggregate metrics
-        total_returns = [r['total_return'] for r in individual_results.values() if 'error' not in r]
-        annualized_returns = [r['annualized_return'] for r in individual_results.values() if 'error' not in r]
-        sharpe_ratios = [r['sharpe_ratio'] for r in individual_results.values() if 'error' not in r and r['sharpe_ratio'] != 0]
-        win_rates = [r['win_rate'] for r in individual_results.values() if 'error' not in r]
-        total_trades = [r['total_trades'] for r in individual_results.values() if 'error' not in r]
-        
-        if not total_returns:
+        # Per-symbol metrics as one narrow frame (valid results only)
+        metric_keys = ('total_return', 'annualized_return', 'sharpe_ratio', 'win_rate', 'total_trades')
+        metrics_df = pd.DataFrame.from_dict(
+            {
+                symbol: {key: r[key] for key in metric_keys}
+                for symbol, r in individual_results.items() if 'error' not in r
+            },
+            orient='index'
+        )
+        
+        if metrics_df.empty:
             return {'error': 'No valid backtest results'}
             
+        # All column reductions in a single agg call
+        stats = metrics_df.agg({
+            'total_return': ['mean', 'median', 'max', 'min'],
+            'annualized_return': ['mean'],
+            'win_rate': ['mean'],
+            'total_trades': ['sum']
+        })
+        sharpe_ratios = metrics_df['sharpe_ratio']
+        sharpe_ratios = sharpe_ratios[sharpe_ratios != 0]
+        num_stocks = len(metrics_df)
+        positive_return_stocks = int(np.count_nonzero(metrics_df['total_return'].to_numpy() > 0))
+        
         # Portfolio statistics
         portfolio_summary = {
-            'num_stocks': len(total_returns),
-            'avg_total_return': np.mean(total_returns),
-            'median_total_return': np.median(total_returns),
-            'best_return': max(total_returns),
-            'worst_return': min(total_returns),
-            'avg_annualized_return': np.mean(annualized_returns),
-            'avg_sharpe_ratio': np.mean(sharpe_ratios) if sharpe_ratios else 0,
-            'avg_win_rate': np.mean(win_rates),
-            'total_trades_all_stocks': sum(total_trades),
-            'positive_return_stocks': len([r for r in total_returns if r > 0]),
-            'profitable_stock_rate': len([r for r in total_returns if r > 0]) / len(total_returns)
+            'num_stocks': num_stocks,
+            'avg_total_return': stats.at['mean', 'total_return'],
+            'median_total_return': stats.at['median', 'total_return'],
+            'best_return': stats.at['max', 'total_return'],
+            'worst_return': stats.at['min', 'total_return'],
+            'avg_annualized_return': stats.at['mean', 'annualized_return'],
+            'avg_sharpe_ratio': sharpe_ratios.mean() if len(sharpe_ratios) else 0,
+            'avg_win_rate': stats.at['mean', 'win_rate'],
+            'total_trades_all_stocks': int(stats.at['sum', 'total_trades']),
+            'positive_return_stocks': positive_return_stocks,
+            'profitable_stock_rate': positive_return_stocks / num_stocks
         }
         
         # Equal-weight portfolio return
-        equal_weight_return = np.mean(total_returns)
+        equal_weight_return = portfolio_summary['avg_total_return']
         portfolio_summary['equal_weight_portfolio_return'] = equal_weight_return
         
+        # Top performers via a partial sort (nlargest)
+        top = metrics_df.nlargest(5, 'total_return')[['total_return', 'sharpe_ratio', 'win_rate']]
+        portfolio_summary['best_performing_stocks'] = (
+            top.rename_axis('symbol').reset_index().to_dict('records')
+        )
+        
         return portfolio_summary
         
     def generate_backtest_report(self, symbol: str = None, save_path: Optional[str] = None) -> str:
@@ -661,46 +900,43 @@ class TradingBacktester:
             
         if save_path:
             Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(save_path, 'w') as f:
-                f.write(report)
+            Path(save_path).write_text(report)
             logger.info(f"Report saved to {save_path}")
             
         return report
         
     def _generate_single_stock_report(self, result: Dict[str, Any]) -> str:
-        """Generate single stock backtest report"""
+        """Generate single stock backtest report (rendered from one template)"""
         
-        lines = [
-            f"BACKTEST REPORT - {result['symbol']}",
-            "=" * 50,
-            f"Report Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "STRATEGY PERFORMANCE:",
-            f"  Total Return: {result['total_return']:.2%}",
-            f"  Annualized Return: {result['annualized_return']:.2%}",
-            f"  Sharpe Ratio: {result['sharpe_ratio']:.3f}",
-            f"  Max Drawdown: {result['max_drawdown']:.2%}",
-            f"  Volatility: {result['volatility']:.2%}",
-            "",
-            "TRADING STATISTICS:",
-            f"  Total Trades: {result['total_trades']}",
-            f"  Winning Trades: {result['winning_trades']}",
-            f"  Win Rate: {result['win_rate']:.2%}",
-            f"  Avg Return per Trade: {result['avg_return_per_trade']:.2%}",
-            "",
-            "BENCHMARK COMPARISON:",
-            f"  Buy & Hold Return: {result['buy_hold_return']:.2%}",
-            f"  Excess Return: {result['excess_return']:.2%}",
-            "",
-            "MODEL PERFORMANCE:",
-            f"  Signal Accuracy: {result['signal_accuracy']['accuracy']:.2%}",
-            f"  Signal Precision: {result['signal_accuracy']['precision']:.2%}",
-            f"  Signal Recall: {result['signal_accuracy']['recall']:.2%}",
-            f"  Probability Threshold: {result['probability_threshold']:.1%}",
-            ""
-        ]
+        accuracy = result['signal_accuracy']
         
-        return "\n".join(lines)
+        return f"""BACKTEST REPORT - {result['symbol']}
+{"=" * 50}
+Report Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+STRATEGY PERFORMANCE:
+  Total Return: {result['total_return']:.2%}
+  Annualized Return: {result['annualized_return']:.2%}
+  Sharpe Ratio: {result['sharpe_ratio']:.3f}
+  Max Drawdown: {result['max_drawdown']:.2%}
+  Volatility: {result['volatility']:.2%}
+
+TRADING STATISTICS:
+  Total Trades: {result['total_trades']}
+  Winning Trades: {result['winning_trades']}
+  Win Rate: {result['win_rate']:.2%}
+  Avg Return per Trade: {result['avg_return_per_trade']:.2%}
+
+BENCHMARK COMPARISON:
+  Buy & Hold Return: {result['buy_hold_return']:.2%}
+  Excess Return: {result['excess_return']:.2%}
+
+MODEL PERFORMANCE:
+  Signal Accuracy: {accuracy['accuracy']:.2%}
+  Signal Precision: {accuracy['precision']:.2%}
+  Signal Recall: {accuracy['recall']:.2%}
+  Probability Threshold: {result['probability_threshold']:.1%}
+"""
         
     def _generate_multi_stock_report(self) -> str:
         """Generate multi-stock portfolio report"""
@@ -708,8 +944,10 @@ class TradingBacktester:
         if not self.backtest_results:
             return "No backtest results available"
             
-        # Calculate portfolio metrics
-        portfolio_summary = self._generate_portfolio_summary(self.backtest_results)
+        # Portfolio metrics: reuse the summary from backtest_multiple_stocks when still current
+        portfolio_summary = self._portfolio_summary
+        if portfolio_summary is None:
+            portfolio_summary = self._generate_portfolio_summary(self.backtest_results)
         
         lines = [
             "MULTI-STOCK PORTFOLIO BACKTEST REPORT",
@@ -735,12 +973,17 @@ class TradingBacktester:
             "-" * 30
         ]
         
-        # Add individual stock results
-        sorted_results = sorted(self.backtest_results.items(), 
-                              key=lambda x: x[1]['total_return'] if 'error' not in x[1] else -999, 
-                              reverse=True)
+        # Add individual stock results, best total return first (errors last)
+        symbols = list(self.backtest_results.keys())
+        results = list(self.backtest_results.values())
+        returns = np.fromiter(
+            (r['total_return'] if 'error' not in r else -999 for r in results),
+            dtype=np.float64, count=len(results)
+        )
+        order = np.argsort(-returns, kind='stable')
         
-        for symbol, result in sorted_results:
+        for k in order:
+            symbol, result = symbols[k], results[k]
             if 'error' in result:
                 lines.append(f"  {symbol}: ERROR - {result['error']}")
             else:
@@ -778,9 +1021,13 @@ class TradingBacktester:
         ax1.legend()
         ax1.grid(True, alpha=0.3)
         
-        # Drawdown plot
+        # Drawdown plot (computed in place in a single reused buffer)
+        portfolio_values = np.asarray(portfolio_values, dtype=np.float64)
         running_max = np.maximum.accumulate(portfolio_values)
-        drawdowns = (np.array(portfolio_values) - running_max) / running_max * 100
+        drawdowns = np.empty_like(portfolio_values)
+        np.subtract(portfolio_values, running_max, out=drawdowns)
+        np.divide(drawdowns, running_max, out=drawdowns)
+        np.multiply(drawdowns, 100, out=drawdowns)
         ax2.fill_between(range(len(drawdowns)), drawdowns, 0, alpha=0.7, color='red')
         ax2.set_title(f'{symbol} - Drawdown')
         ax2.set_ylabel('Drawdown (%)')
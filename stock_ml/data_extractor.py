@@ -3,32 +3,165 @@ Data extraction module for stock data from PostgreSQL database.
 Supports extracting data for multiple instruments and training separate models.
 """
 
+import importlib.util
+import tempfile
 import pandas as pd
 import numpy as np
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from joblib import Parallel, delayed
 from typing import Tuple, Optional, List, Dict
 import logging
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote_plus
 
 # Set up logging using centralized configuration
 try:
     from .logging_config import get_ml_logger
+    from .jit_utils import njit, NUMBA_AVAILABLE
 except ImportError:
     from logging_config import get_ml_logger
+    from jit_utils import njit, NUMBA_AVAILABLE
 logger = get_ml_logger(__name__)
 
+# Column dtypes requested at read time: single precision is ample for daily closes
+PRICE_DTYPES = {'close_price': 'float32'}
+
+# Explicit dtypes for the COPY CSV stream so nothing is re-inferred from text: tickers such as
+# "NA" or "1234" stay strings, and only empty fields (SQL NULLs) become NaN
+PRICE_CSV_DTYPES = {'symbol': str, 'currency': str, 'volume': 'int64', **PRICE_DTYPES}
+PRICE_CSV_NA_VALUES = {'close_price': [''], 'volume': ['']}
+
+# COPY output is buffered in memory up to this size, then spilled to a temporary file
+COPY_SPOOL_BYTES = 16 * 1024 * 1024
+
+# Per-symbol string columns repeat one value on every row: store them as categorical codes
+CATEGORY_DTYPES = {'symbol': 'category', 'currency': 'category'}
+
+# Arrow-based reader for bulk extraction (optional)
+try:
+    import connectorx as cx
+    CONNECTORX_AVAILABLE = True
+except ImportError:
+    CONNECTORX_AVAILABLE = False
+
+# Parquet engine for the incremental per-symbol price cache (optional)
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+def _span_days(dates: np.ndarray) -> int:
+    """Whole days between the first and last entry of a sorted datetime64 array"""
+    return int((dates[-1] - dates[0]) // np.timedelta64(1, 'D'))
+
+
+def _range_days(dates: np.ndarray) -> int:
+    """Whole days between the earliest and latest entry of a datetime64 array in any order"""
+    return int((dates.max() - dates.min()) // np.timedelta64(1, 'D'))
+
+
+@njit(cache=True, nogil=True)
+def _has_price_issues(close, volume):
+    """Return True at the first missing value, non-positive price or negative volume"""
+    for i in range(close.shape[0]):
+        c = close[i]
+        v = volume[i]
+        if not c > 0 or not v >= 0:
+            return True
+    return False
+
+
+@njit(cache=True, nogil=True)
+def _count_price_issues(close, volume):
+    """
+    Count missing values, non-positive prices and negative volumes in one pass.
+    
+    Returns:
+        Tuple of (missing_values, non_positive_prices, negative_volume)
+    """
+    missing = 0
+    non_positive = 0
+    negative = 0
+    for i in range(close.shape[0]):
+        c = close[i]
+        v = volume[i]
+        if c != c:
+            missing += 1
+        elif c <= 0:
+            non_positive += 1
+        if v != v:
+            missing += 1
+        elif v < 0:
+            negative += 1
+    return missing, non_positive, negative
+
+
+
+def _price_issues_present(close: np.ndarray, volume: np.ndarray) -> bool:
+    """Dispatch the early-exit price scan to the compiled kernel or NumPy reductions"""
+    if NUMBA_AVAILABLE:
+        return _has_price_issues(close, volume)
+    return bool(np.isnan(close).any() or (close <= 0).any()
+                or np.isnan(volume).any() or (volume < 0).any())
+
+
+def _price_issue_counts(close: np.ndarray, volume: np.ndarray) -> Tuple[int, int, int]:
+    """Dispatch the price issue counts to the compiled kernel or NumPy reductions"""
+    if NUMBA_AVAILABLE:
+        return _count_price_issues(close, volume)
+    missing = int(np.isnan(close).sum()) + int(np.isnan(volume).sum())
+    return missing, int(np.count_nonzero(close <= 0)), int(np.count_nonzero(volume < 0))
+
+@njit(cache=True, nogil=True)
+def _date_order_checks(dates, offsets, train_ratio, val_ratio,
+                       duplicates, out_of_order, train_val_leak, val_test_leak):
+    """
+    Check the date ordering of every symbol in one compiled call.
+    
+    dates holds all symbols' dates (int64) back to back; symbol i spans
+    dates[offsets[i]:offsets[i + 1]]. Per symbol this counts duplicate dates and
+    unsorted positions, and flags leakage across the train/val and val/test
+    boundaries that split_data_chronologically would produce (after sorting).
+    """
+    for i in range(offsets.shape[0] - 1):
+        seg = dates[offsets[i]:offsets[i + 1]]
+        n = seg.shape[0]
+        unsorted = 0
+        for j in range(1, n):
+            if seg[j] < seg[j - 1]:
+                unsorted += 1
+        if unsorted > 0:
+            seg = np.sort(seg)
+        dup = 0
+        for j in range(1, n):
+            if seg[j] == seg[j - 1]:
+                dup += 1
+        duplicates[i] = dup
+        out_of_order[i] = unsorted
+        
+        train_end = int(train_ratio * n)
+        val_end = train_end + int(val_ratio * n)
+        train_val_leak[i] = 0 < train_end < val_end and seg[train_end - 1] >= seg[train_end]
+        val_test_leak[i] = train_end < val_end < n and seg[val_end - 1] >= seg[val_end]
+
 
 class MultiStockDataExtractor:
     """Extract stock data from PostgreSQL database for multiple instruments"""
     
-    def __init__(self, db_config: dict = None, schema: str = None):
+    def __init__(self, db_config: dict = None, schema: str = None, max_connections: int = 8,
+                 backend: str = 'psycopg2', cache_dir: Optional[str] = None):
         """
         Initialize the data extractor
         
         Args:
             db_config: Database configuration dictionary
             schema: Database schema name (required for environment-agnostic operation)
+            max_connections: Size of the connection pool used for parallel per-symbol extraction
+            backend: Reader for the bulk query, 'psycopg2' or 'connectorx' (Arrow, falls back to psycopg2)
+            cache_dir: Directory for per-schema, per-symbol parquet caches of historical prices;
+                only rows newer than the cached history are queried, and a cache whose rows
+                were rewritten in the database is reloaded in full. None disables the cache
         """
         self.db_config = db_config or {
             'host': 'localhost',
@@ -40,7 +173,27 @@ class MultiStockDataExtractor:
         if schema is None:
             raise ValueError("Schema parameter is required for environment-agnostic operation")
         self.schema = schema
+        self.max_connections = max(1, max_connections)
+        if backend not in ('psycopg2', 'connectorx'):
+            raise ValueError(f"Unsupported backend: {backend}")
+        if backend == 'connectorx' and not CONNECTORX_AVAILABLE:
+            logger.warning("ConnectorX not available, falling back to psycopg2 reader")
+            backend = 'psycopg2'
+        self.backend = backend
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None and not PARQUET_AVAILABLE:
+            logger.warning("pyarrow not available. Price cache disabled.")
+            self.cache_dir = None
+        self._available_stocks = None
         self.pg_conn = None
+        self.pool = None
+        
+    def __getstate__(self):
+        """Drop open connections when pickled; worker processes reconnect lazily"""
+        state = self.__dict__.copy()
+        state['pg_conn'] = None
+        state['pool'] = None
+        return state
         
     def connect(self):
         """Establish database connection"""
@@ -57,13 +210,78 @@ class MultiStockDataExtractor:
             logger.error(f"Failed to connect to database: {e}")
             raise
             
-    def get_available_stocks(self) -> List[str]:
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Lazily create the thread-safe connection pool used for per-symbol queries"""
+        if self.pool is None:
+            try:
+                self.pool = ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=self.max_connections,
+                    host=self.db_config['host'],
+                    port=self.db_config['port'],
+                    database=self.db_config['database'],
+                    user=self.db_config['user'],
+                    password=self.db_config['password']
+                )
+                logger.info(f"Database connection pool established (max {self.max_connections} connections)")
+            except Exception as e:
+                logger.error(f"Failed to create database connection pool: {e}")
+                raise
+        return self.pool
+            
+    def _connection_uri(self) -> str:
+        """Build a PostgreSQL URI from the database configuration"""
+        cfg = self.db_config
+        return (f"postgresql://{quote_plus(str(cfg['user']))}:{quote_plus(str(cfg['password']))}"
+                f"@{cfg['host']}:{cfg['port']}/{cfg['database']}")
+            
+    def _read_price_query(self, conn, query: str, params: Optional[list] = None) -> pd.DataFrame:
+        """
+        Run a price query through COPY ... TO STDOUT and parse the CSV stream in pandas
+        
+        This bypasses the DB-API row tuples that read_sql_query builds for every record.
+        Server-side prepared statements are deliberately not used here: COPY only accepts a
+        literal query, not EXECUTE of a prepared statement, and for a few thousand rows per
+        symbol the saved tuple conversion outweighs the per-query planning cost.
+        
+        The driver streams COPY output in chunks into a spooled buffer, so large (bulk)
+        results spill to disk instead of holding the raw CSV text in memory next to the
+        parsed frame.
+        
+        Args:
+            conn: Open psycopg2 connection
+            query: SELECT statement with %s placeholders
+            params: Values bound into the placeholders (safely quoted by the driver)
+            
+        Returns:
+            DataFrame with the query columns
+        """
+        with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_BYTES) as buf:
+            with conn.cursor() as cur:
+                select = cur.mogrify(query.strip().rstrip(';'), params)
+                cur.copy_expert(b"COPY (" + select + b") TO STDOUT WITH (FORMAT CSV, HEADER)", buf)
+            buf.seek(0)
+            df = pd.read_csv(buf, parse_dates=['trading_date_local'], dtype=PRICE_CSV_DTYPES,
+                             keep_default_na=False, na_values=PRICE_CSV_NA_VALUES)
+        
+        # An empty result has no values to parse, which leaves the date column as object
+        if df.empty:
+            df['trading_date_local'] = pd.to_datetime(df['trading_date_local'])
+        return df
+            
+    def get_available_stocks(self, refresh: bool = False) -> List[str]:
         """
         Get list of all available stock symbols in the database
         
+        Args:
+            refresh: Re-query the database instead of returning the memoized list
+            
         Returns:
             List of stock symbols
         """
+        if self._available_stocks is not None and not refresh:
+            return list(self._available_stocks)
+            
         if not self.pg_conn:
             self.connect()
             
@@ -78,39 +296,157 @@ class MultiStockDataExtractor:
         try:
             result = pd.read_sql_query(query, self.pg_conn)
             symbols = result['symbol'].tolist()
+            self._available_stocks = symbols
             
             logger.info(f"Found {len(symbols)} available stocks: {symbols}")
-            return symbols
+            return list(symbols)
             
         except Exception as e:
             logger.error(f"Failed to get available stocks: {e}")
             raise
             
-    def extract_all_stocks_data(self) -> Dict[str, pd.DataFrame]:
+    def extract_all_stocks_data(self, symbols: Optional[List[str]] = None,
+                                max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
         """
         Extract data for all available stocks
         
+        Without a symbol subset all stocks are fetched with a single bulk query.
+        A subset is queried per symbol, concurrently, each on its own pooled connection.
+        
+        Args:
+            symbols: Optional subset of symbols to extract (default: all available stocks)
+            max_workers: Number of concurrent queries for a subset (default: pool size)
+            
         Returns:
             Dictionary mapping symbol -> DataFrame
         """
-        stocks = self.get_available_stocks()
-        all_data = {}
+        if symbols is None:
+            return self.extract_all_stocks_data_bulk()
+            
+        stocks = list(symbols)
+        if not stocks:
+            logger.info("Successfully extracted data for 0 stocks")
+            return {}
+            
+        workers = min(max_workers or self.max_connections, self.max_connections, len(stocks))
+        self._get_pool()
+        extracted = {}
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.extract_single_stock_data, symbol): symbol for symbol in stocks}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    df = future.result()
+                    if not df.empty:
+                        extracted[symbol] = df
+                        logger.info(f"Successfully extracted {len(df)} records for {symbol}")
+                    else:
+                        logger.warning(f"No data found for {symbol}")
+                except Exception as e:
+                    logger.error(f"Failed to extract data for {symbol}: {e}")
+                    
+        # Preserve the requested symbol ordering
+        all_data = {symbol: extracted[symbol] for symbol in stocks if symbol in extracted}
+                
+        logger.info(f"Successfully extracted data for {len(all_data)} stocks")
+        return all_data
+        
+    def extract_all_stocks_data_bulk(self) -> Dict[str, pd.DataFrame]:
+        """
+        Extract data for all available stocks with one query, split per symbol in pandas
+        
+        Returns:
+            Dictionary mapping symbol -> DataFrame
+        """
+        query = f"""
+        SELECT
+            bi.symbol,
+            bi.currency,
+            sp.close_price,
+            sp.volume,
+            sp.trading_date_local
+        FROM
+            {self.schema}.base_instruments AS bi
+        JOIN
+            {self.schema}.stock_prices AS sp ON bi.id = sp.stock_id
+        WHERE
+            bi.instrument_type = 'stock'
+        ORDER BY
+            bi.symbol, sp.trading_date_local ASC;
+        """
         
-        for symbol in stocks:
+        df = None
+        if self.backend == 'connectorx':
+            # The bulk query has no bind parameters, so it can go straight to the Arrow reader
             try:
-                df = self.extract_single_stock_data(symbol)
-                if not df.empty:
-                    all_data[symbol] = df
-                    logger.info(f"Successfully extracted {len(df)} records for {symbol}")
-                else:
-                    logger.warning(f"No data found for {symbol}")
+                df = cx.read_sql(self._connection_uri(), query, return_type='pandas')
+                df['trading_date_local'] = pd.to_datetime(df['trading_date_local'])
+                df = df.astype(PRICE_DTYPES)
             except Exception as e:
-                logger.error(f"Failed to extract data for {symbol}: {e}")
-                continue
+                logger.warning(f"ConnectorX bulk read failed, falling back to psycopg2: {e}")
+                df = None
                 
+        if df is None:
+            if not self.pg_conn:
+                self.connect()
+            try:
+                df = self._read_price_query(self.pg_conn, query)
+            except Exception as e:
+                logger.error(f"Failed to extract bulk stock data: {e}")
+                raise
+            
+        all_data = {}
+        for symbol, symbol_df in df.groupby('symbol', sort=False):
+            symbol_df = symbol_df.reset_index(drop=True).astype(CATEGORY_DTYPES)
+            self._validate_data_quality(symbol_df, symbol)
+            all_data[symbol] = symbol_df
+            logger.info(f"Successfully extracted {len(symbol_df)} records for {symbol}")
+            
         logger.info(f"Successfully extracted data for {len(all_data)} stocks")
         return all_data
             
+    def _price_cache_path(self, symbol: str) -> Optional[Path]:
+        """Parquet cache file for a symbol, kept per schema so environments never share history"""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / self.schema / f"{symbol}.parquet"
+        
+    def _price_fingerprints(self, conn, symbol: str, last_cached) -> Tuple[str, str]:
+        """
+        Fingerprint a symbol's stored prices from their raw_data_hash values
+        
+        Upserts rewrite close_price/volume and raw_data_hash in place, so a cached row is
+        only trusted while the fingerprint of the rows it covers is unchanged.
+        
+        Args:
+            conn: Open psycopg2 connection
+            symbol: Stock symbol
+            last_cached: Last cached trading date, or None when nothing is cached
+            
+        Returns:
+            Tuple of (fingerprint of rows up to last_cached, fingerprint of all rows),
+            each formatted as "<row count>:<md5>"
+        """
+        query = f"""
+        SELECT
+            COUNT(*) FILTER (WHERE sp.trading_date_local <= %(last_cached)s),
+            MD5(STRING_AGG(COALESCE(sp.raw_data_hash, ''), ',' ORDER BY sp.trading_date_local)
+                FILTER (WHERE sp.trading_date_local <= %(last_cached)s)),
+            COUNT(*),
+            MD5(STRING_AGG(COALESCE(sp.raw_data_hash, ''), ',' ORDER BY sp.trading_date_local))
+        FROM
+            {self.schema}.base_instruments AS bi
+        JOIN
+            {self.schema}.stock_prices AS sp ON bi.id = sp.stock_id
+        WHERE
+            bi.symbol = %(symbol)s;
+        """
+        with conn.cursor() as cur:
+            cur.execute(query, {'symbol': symbol, 'last_cached': last_cached})
+            cached_count, cached_md5, total_count, total_md5 = cur.fetchone()
+        return f"{cached_count}:{cached_md5}", f"{total_count}:{total_md5}"
+        
     def extract_single_stock_data(self, symbol: str) -> pd.DataFrame:
         """
         Extract data for a single stock symbol
@@ -121,8 +457,32 @@ class MultiStockDataExtractor:
         Returns:
             DataFrame with columns: symbol, currency, close_price, volume, trading_date_local
         """
-        if not self.pg_conn:
-            self.connect()
+        pool = self._get_pool()
+        
+        # Cached history is only reused while it still matches the table (upserts can rewrite it)
+        cache_path = self._price_cache_path(symbol)
+        cached = pd.read_parquet(cache_path) if cache_path is not None and cache_path.exists() else None
+        if cached is not None and cached.empty:
+            cached = None
+        last_cached = cached['trading_date_local'].iloc[-1].date() if cached is not None else None
+        
+        fingerprint = None
+        if cache_path is not None:
+            conn = pool.getconn()
+            try:
+                cached_fingerprint, fingerprint = self._price_fingerprints(conn, symbol, last_cached)
+            finally:
+                pool.putconn(conn)
+            if cached is not None and cached.attrs.get('raw_data_fingerprint') != cached_fingerprint:
+                logger.info(f"{symbol}: cached prices changed in the database, reloading full history")
+                cached = None
+                last_cached = None
+        
+        params = [symbol]
+        date_filter = ""
+        if cached is not None:
+            date_filter = "AND sp.trading_date_local > %s"
+            params.append(last_cached)
             
         query = f"""
         SELECT
@@ -137,20 +497,37 @@ class MultiStockDataExtractor:
             {self.schema}.stock_prices AS sp ON bi.id = sp.stock_id
         WHERE
             bi.symbol = %s
+            {date_filter}
         ORDER BY
             sp.trading_date_local ASC;
         """
         
         try:
-            df = pd.read_sql_query(query, self.pg_conn, params=[symbol])
+            conn = pool.getconn()
+            try:
+                df = self._read_price_query(conn, query, params)
+            finally:
+                pool.putconn(conn)
+                
+            if cached is not None:
+                logger.info(f"{symbol}: {len(df)} new records on top of {len(cached)} cached")
+                if not df.empty:
+                    df = pd.concat([cached, df], ignore_index=True)
+                    df.attrs['raw_data_fingerprint'] = fingerprint
+                    df.to_parquet(cache_path, compression='snappy')
+                else:
+                    df = cached
+            elif cache_path is not None and not df.empty:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                df.attrs['raw_data_fingerprint'] = fingerprint
+                df.to_parquet(cache_path, compression='snappy')
             
             # Validate data
             if df.empty:
                 logger.warning(f"No data found for symbol: {symbol}")
                 return pd.DataFrame()
                 
-            # Convert date column to datetime
-            df['trading_date_local'] = pd.to_datetime(df['trading_date_local'])
+            df = df.astype(CATEGORY_DTYPES)
             
             # Data quality checks
             self._validate_data_quality(df, symbol)
@@ -161,32 +538,78 @@ class MultiStockDataExtractor:
             logger.error(f"Failed to extract data for {symbol}: {e}")
             raise
             
+    def extract_single_stock_arrays(self, symbol: str) -> Dict[str, object]:
+        """
+        Extract data for a single stock symbol as columnar NumPy arrays
+        
+        Args:
+            symbol: Stock symbol to extract
+            
+        Returns:
+            Dictionary with 'close' (float32), 'volume', 'date' (datetime64[ns]) arrays
+            plus scalar 'symbol' and 'currency'; empty dict if no data was found
+        """
+        df = self.extract_single_stock_data(symbol)
+        if df.empty:
+            return {}
+            
+        return {
+            'close': df['close_price'].to_numpy(dtype=np.float32),
+            'volume': df['volume'].to_numpy(),
+            'date': df['trading_date_local'].to_numpy(dtype='datetime64[ns]'),
+            'symbol': symbol,
+            'currency': df['currency'].iat[0]
+        }
+            
     def _validate_data_quality(self, df: pd.DataFrame, symbol: str):
         """Validate data quality for a specific stock"""
+        close = df['close_price'].to_numpy(dtype=np.float64, na_value=np.nan)
+        volume = df['volume'].to_numpy(dtype=np.float64, na_value=np.nan)
+        dates = df['trading_date_local'].to_numpy()
+        other_cols = [col for col in df.columns if col not in ('close_price', 'volume', 'trading_date_local')]
+        
+        # Fast path for the common clean case: every check stops at its first offending row.
+        # Strictly increasing dates rule out duplicates and NaT (NaT never compares greater).
+        clean = (not _price_issues_present(close, volume)
+                 and not np.isnat(dates[:1]).any()
+                 and bool((dates[1:] > dates[:-1]).all())
+                 and not any(df[col].hasnans for col in other_cols))
+        
+        if clean:
+            missing = non_positive = negative = duplicates = 0
+        else:
+            missing, non_positive, negative = _price_issue_counts(close, volume)
+            
+            # Remaining (date and string) columns are cheap to check directly
+            missing += int(np.isnat(dates).sum())
+            for col in other_cols:
+                missing += int(df[col].isna().sum())
+            duplicates = len(dates) - len(np.unique(dates))
+            
         checks = {
-            'missing_values': df.isnull().sum().sum(),
-            'duplicate_dates': df['trading_date_local'].duplicated().sum(),
-            'non_positive_prices': (df['close_price'] <= 0).sum(),
-            'negative_volume': (df['volume'] < 0).sum(),
+            'missing_values': missing,
+            'duplicate_dates': duplicates,
+            'non_positive_prices': non_positive,
+            'negative_volume': negative,
         }
         
-        # Always log data quality checks at INFO level
-        logger.info(f"Data quality check for {symbol}: {checks}")
+        # Per-check counts at DEBUG (formatted lazily); issues and the summary stay visible
+        logger.debug("Data quality check for %s: %s", symbol, checks)
         
         # Log specific issues as warnings
         if checks['non_positive_prices'] > 0:
-            logger.warning(f"{symbol}: Found {checks['non_positive_prices']} non-positive prices")
+            logger.warning("%s: Found %d non-positive prices", symbol, checks['non_positive_prices'])
         if checks['negative_volume'] > 0:
-            logger.warning(f"{symbol}: Found {checks['negative_volume']} negative volumes")
+            logger.warning("%s: Found %d negative volumes", symbol, checks['negative_volume'])
         if checks['duplicate_dates'] > 0:
-            logger.warning(f"{symbol}: Found {checks['duplicate_dates']} duplicate dates")
+            logger.warning("%s: Found %d duplicate dates", symbol, checks['duplicate_dates'])
         
         # Log summary of data quality status
         total_issues = sum(checks.values())
         if total_issues == 0:
-            logger.info(f"{symbol}: ✅ Data quality validation passed")
+            logger.info("%s: ✅ Data quality validation passed", symbol)
         else:
-            logger.warning(f"{symbol}: ⚠️ Found {total_issues} total data quality issues")
+            logger.warning("%s: ⚠️ Found %d total data quality issues", symbol, total_issues)
             
     def filter_stocks_by_data_quality(self, all_data: Dict[str, pd.DataFrame], 
                                     min_records: int = 500,
@@ -202,21 +625,28 @@ class MultiStockDataExtractor:
         Returns:
             Filtered dictionary of stock data
         """
-        filtered_data = {}
-        
-        for symbol, df in all_data.items():
-            if len(df) < min_records:
-                logger.info(f"Excluding {symbol}: Only {len(df)} records (need >= {min_records})")
-                continue
-                
-            date_range = (df['trading_date_local'].max() - df['trading_date_local'].min()).days / 365.25
-            if date_range < min_years:
-                logger.info(f"Excluding {symbol}: Only {date_range:.1f} years of data (need >= {min_years})")
-                continue
-                
-            filtered_data[symbol] = df
-            logger.info(f"Keeping {symbol}: {len(df)} records, {date_range:.1f} years")
+        # One row per symbol; the earliest/latest dates bound its history (frames need not be sorted)
+        summary = pd.DataFrame({
+            'records': [len(df) for df in all_data.values()],
+            'span_days': [
+                _range_days(df['trading_date_local'].to_numpy()) if len(df) else 0
+                for df in all_data.values()
+            ],
+        }, index=pd.Index(list(all_data), name='symbol'))
+        summary['years'] = summary['span_days'] / 365.25
+        
+        too_few_records = summary['records'] < min_records
+        too_short = ~too_few_records & (summary['years'] < min_years)
+        keep = ~(too_few_records | too_short)
+        
+        for symbol, records in summary.loc[too_few_records, 'records'].items():
+            logger.info(f"Excluding {symbol}: Only {records} records (need >= {min_records})")
+        for symbol, years in summary.loc[too_short, 'years'].items():
+            logger.info(f"Excluding {symbol}: Only {years:.1f} years of data (need >= {min_years})")
+        for symbol, records, years in summary.loc[keep, ['records', 'years']].itertuples():
+            logger.info(f"Keeping {symbol}: {records} records, {years:.1f} years")
             
+        filtered_data = {symbol: all_data[symbol] for symbol in summary.index[keep]}
         logger.info(f"Filtered to {len(filtered_data)} stocks meeting quality criteria")
         return filtered_data
             
@@ -242,42 +672,56 @@ class MultiStockDataExtractor:
         # Get symbol for logging (if available)
         symbol = df['symbol'].iloc[0] if 'symbol' in df.columns and not df.empty else 'unknown'
         
-        # Log input data characteristics
-        if not df.empty:
-            date_range_days = (df['trading_date_local'].max() - df['trading_date_local'].min()).days
-            date_range_years = date_range_days / 365.25
-            logger.info(f"📊 Time series split for {symbol}: {len(df)} records over {date_range_years:.1f} years ({date_range_days} days)")
-            logger.info(f"   Date range: {df['trading_date_local'].min().date()} to {df['trading_date_local'].max().date()}")
-            logger.info(f"   Split ratios: Train {train_ratio:.1%}, Val {val_ratio:.1%}, Test {test_ratio:.1%}")
-        else:
+        if df.empty:
             logger.warning(f"⚠️  Empty DataFrame provided for chronological split ({symbol})")
             return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
             
-        # Sort by date to ensure chronological order
-        df_sorted = df.sort_values('trading_date_local').reset_index(drop=True)
+        # Sort by date to ensure chronological order (extracted data already arrives sorted)
+        if df['trading_date_local'].is_monotonic_increasing:
+            df_sorted = df if df.index.equals(pd.RangeIndex(len(df))) else df.reset_index(drop=True)
+        else:
+            df_sorted = df.sort_values('trading_date_local', kind='mergesort', ignore_index=True)
+        dates = df_sorted['trading_date_local']
+        
+        # Log input data characteristics (first/last rows of the sorted frame bound the range)
+        date_range_days = _span_days(dates.to_numpy())
+        date_range_years = date_range_days / 365.25
+        logger.info("📊 Time series split for %s: %d records over %.1f years (%d days)",
+                    symbol, len(df), date_range_years, date_range_days)
+        logger.debug("   Split ratios: Train %.1f%%, Val %.1f%%, Test %.1f%%",
+                     100 * train_ratio, 100 * val_ratio, 100 * test_ratio)
         
         n = len(df_sorted)
         train_size = int(train_ratio * n)
         val_size = int(val_ratio * n)
         test_size = n - train_size - val_size  # Ensure all records are accounted for
         
+        # Positional slices, copied: without copy-on-write (off by default before pandas 3)
+        # they would be views of df_sorted, which is the caller's frame when already sorted
         train_df = df_sorted.iloc[:train_size].copy()
         val_df = df_sorted.iloc[train_size:train_size + val_size].copy()
         test_df = df_sorted.iloc[train_size + val_size:].copy()
         
-        # Log split results with detailed information
-        logger.info(f"✅ Time series split completed for {symbol}:")
-        logger.info(f"   📈 Train: {len(train_df)} records ({len(train_df)/n:.1%}) | {train_df['trading_date_local'].min().date()} to {train_df['trading_date_local'].max().date()}")
-        logger.info(f"   📊 Val:   {len(val_df)} records ({len(val_df)/n:.1%}) | {val_df['trading_date_local'].min().date()} to {val_df['trading_date_local'].max().date()}")
-        logger.info(f"   📋 Test:  {len(test_df)} records ({len(test_df)/n:.1%}) | {test_df['trading_date_local'].min().date()} to {test_df['trading_date_local'].max().date()}")
+        # Log split results; the per-split date ranges are only built when DEBUG is enabled
+        logger.info("✅ Time series split completed for %s: Train %d | Val %d | Test %d records",
+                    symbol, len(train_df), len(val_df), len(test_df))
+        if logger.isEnabledFor(logging.DEBUG):
+            bounds = (0, train_size, train_size + val_size, n)
+            for label, start, end in zip(("📈 Train:", "📊 Val:  ", "📋 Test: "), bounds[:-1], bounds[1:]):
+                if start < end:
+                    logger.debug("   %s %d records (%.1f%%) | %s to %s", label, end - start,
+                                 100 * (end - start) / n, dates.iat[start].date(), dates.iat[end - 1].date())
+                else:
+                    logger.debug("   %s 0 records", label)
         
-        # Verify no data leakage (chronological order)
+        # Verify no data leakage (chronological order): the frame is sorted, so only the
+        # dates on either side of each split boundary need comparing
         if (not train_df.empty and not val_df.empty and 
-            train_df['trading_date_local'].max() >= val_df['trading_date_local'].min()):
+            dates.iat[train_size - 1] >= dates.iat[train_size]):
             logger.warning(f"⚠️  Potential data leakage detected in {symbol}: Train max date >= Val min date")
             
         if (not val_df.empty and not test_df.empty and 
-            val_df['trading_date_local'].max() >= test_df['trading_date_local'].min()):
+            dates.iat[train_size + val_size - 1] >= dates.iat[train_size + val_size]):
             logger.warning(f"⚠️  Potential data leakage detected in {symbol}: Val max date >= Test min date")
             
         # Verify split integrity
@@ -289,10 +733,58 @@ class MultiStockDataExtractor:
         
         return train_df, val_df, test_df
         
+    def check_all_stocks_dates(self, all_data: Dict[str, pd.DataFrame],
+                               train_ratio: float = 0.6,
+                               val_ratio: float = 0.2) -> pd.DataFrame:
+        """
+        Check date ordering and split-boundary leakage for all stocks in one pass
+        
+        Args:
+            all_data: Dictionary of stock DataFrames
+            train_ratio: Training set proportion used for the boundary checks
+            val_ratio: Validation set proportion used for the boundary checks
+            
+        Returns:
+            DataFrame indexed by symbol with duplicate_dates, out_of_order,
+            train_val_leak and val_test_leak columns
+        """
+        symbols = list(all_data.keys())
+        lengths = np.fromiter((len(df) for df in all_data.values()), dtype=np.int64, count=len(symbols))
+        offsets = np.zeros(len(symbols) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        dates = np.concatenate(
+            [df['trading_date_local'].to_numpy(dtype='datetime64[ns]').view(np.int64) for df in all_data.values()]
+        ) if symbols else np.empty(0, dtype=np.int64)
+        
+        duplicates = np.zeros(len(symbols), dtype=np.int64)
+        out_of_order = np.zeros(len(symbols), dtype=np.int64)
+        train_val_leak = np.zeros(len(symbols), dtype=np.bool_)
+        val_test_leak = np.zeros(len(symbols), dtype=np.bool_)
+        _date_order_checks(dates, offsets, train_ratio, val_ratio,
+                           duplicates, out_of_order, train_val_leak, val_test_leak)
+        
+        return pd.DataFrame({
+            'duplicate_dates': duplicates,
+            'out_of_order': out_of_order,
+            'train_val_leak': train_val_leak,
+            'val_test_leak': val_test_leak
+        }, index=pd.Index(symbols, name='symbol'))
+        
+    def _split_symbol(self, symbol: str, df: pd.DataFrame, train_ratio: float, val_ratio: float,
+                      test_ratio: float) -> Optional[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+        """Split a single symbol chronologically; returns None on failure"""
+        try:
+            return self.split_data_chronologically(df, train_ratio, val_ratio, test_ratio)
+        except Exception as e:
+            logger.error(f"❌ Failed to split data for {symbol}: {e}")
+            return None
+            
     def split_all_stocks_data(self, all_data: Dict[str, pd.DataFrame],
                             train_ratio: float = 0.6,
                             val_ratio: float = 0.2,
-                            test_ratio: float = 0.2) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+                            test_ratio: float = 0.2,
+                            n_jobs: int = 1,
+                            check_dates: bool = False) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
         """
         Split data for all stocks chronologically
         
@@ -301,24 +793,35 @@ class MultiStockDataExtractor:
             train_ratio: Training set proportion
             val_ratio: Validation set proportion  
             test_ratio: Test set proportion
+            n_jobs: Number of worker processes (default 1: splitting is positional slicing,
+                so shipping frames to other processes only pays off for heavy inputs)
+            check_dates: Log duplicate/out-of-order dates and split-boundary leakage for every
+                symbol first (diagnostic only; needs numba, skipped without it)
             
         Returns:
             Dictionary mapping symbol -> (train_df, val_df, test_df)
         """
-        split_data = {}
-        
         logger.info(f"🔄 Starting chronological data splits for {len(all_data)} stocks")
         
-        for symbol, df in all_data.items():
+        # Optional date checks for every symbol in one compiled call before splitting
+        if check_dates and not NUMBA_AVAILABLE:
+            logger.warning("⚠️  numba not available, skipping batch date checks")
+        elif check_dates:
             try:
-                train_df, val_df, test_df = self.split_data_chronologically(
-                    df, train_ratio, val_ratio, test_ratio
-                )
-                split_data[symbol] = (train_df, val_df, test_df)
-                
+                date_checks = self.check_all_stocks_dates(all_data, train_ratio, val_ratio)
+                leaking = date_checks.index[date_checks['train_val_leak'] | date_checks['val_test_leak']]
+                logger.info(f"🔍 Date checks: {int((date_checks['duplicate_dates'] > 0).sum())} stocks with duplicate dates, "
+                            f"{int((date_checks['out_of_order'] > 0).sum())} out of order, "
+                            f"{len(leaking)} with split-boundary leakage {list(leaking)}")
             except Exception as e:
-                logger.error(f"❌ Failed to split data for {symbol}: {e}")
-                continue
+                logger.warning(f"⚠️  Batch date checks failed: {e}")
+        
+        symbols = list(all_data.keys())
+        splits = Parallel(n_jobs=n_jobs, backend='loky', batch_size=1)(
+            delayed(self._split_symbol)(symbol, all_data[symbol], train_ratio, val_ratio, test_ratio)
+            for symbol in symbols
+        )
+        split_data = {symbol: split for symbol, split in zip(symbols, splits) if split is not None}
                 
         logger.info(f"✅ Completed chronological splits for {len(split_data)}/{len(all_data)} stocks")
                 
@@ -329,27 +832,22 @@ class MultiStockDataExtractor:
         if df.empty:
             return {'error': 'Empty DataFrame'}
             
+        # One aggregation call for both numeric columns instead of eight separate reductions
+        stats = df[['close_price', 'volume']].agg(['min', 'max', 'mean', 'std']).astype(float)
+        start = df['trading_date_local'].min()
+        end = df['trading_date_local'].max()
+        
         summary = {
             'symbol': df['symbol'].iloc[0],
             'currency': df['currency'].iloc[0],
             'total_records': len(df),
             'date_range': {
-                'start': df['trading_date_local'].min().date(),
-                'end': df['trading_date_local'].max().date(),
-                'days': (df['trading_date_local'].max() - df['trading_date_local'].min()).days
-            },
-            'price_stats': {
-                'min': float(df['close_price'].min()),
-                'max': float(df['close_price'].max()),
-                'mean': float(df['close_price'].mean()),
-                'std': float(df['close_price'].std())
+                'start': start.date(),
+                'end': end.date(),
+                'days': (end - start).days
             },
-            'volume_stats': {
-                'min': float(df['volume'].min()),
-                'max': float(df['volume'].max()),
-                'mean': float(df['volume'].mean()),
-                'std': float(df['volume'].std())
-            }
+            'price_stats': stats['close_price'].to_dict(),
+            'volume_stats': stats['volume'].to_dict()
         }
         
         return summary
@@ -362,7 +860,11 @@ class MultiStockDataExtractor:
         return summaries
         
     def close(self):
-        """Close database connection"""
+        """Close database connection and connection pool"""
+        if self.pool is not None:
+            self.pool.closeall()
+            self.pool = None
+            logger.info("Database connection pool closed")
         if self.pg_conn:
             self.pg_conn.close()
             logger.info("Database connection closed")
@@ -9,16 +9,108 @@ Provides database operations for ML pipeline artifacts including:
 - Backtesting results storage
 """
 
-from typing import Dict, List, Any, Optional
-from datetime import datetime, date, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime, date
+from dateutil.relativedelta import relativedelta
+import asyncio
+import csv
+import io
 import json
 import logging
+import time
 import numpy as np
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import bindparam, insert, text, update
+from sqlalchemy.sql import column, table
 from stock_etl.core.database import get_dev_database, get_test_database, get_prod_database
 from .schema_validator import create_validator
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+
+# Rows per executemany call for bulk INSERTs
+INSERT_BATCH_SIZE = 1000
+
+# Seconds a get_latest_model lookup is served from the in-process cache
+LATEST_MODEL_CACHE_TTL = 300
+
+# Column order for COPY ... FROM STDIN into ml_feature_data
+FEATURE_DATA_COLUMNS = (
+    'model_id', 'instrument_id', 'trading_date', 'trading_date_epoch',
+    'open_price', 'high_price', 'low_price', 'close_price', 'volume',
+    'rsi_14', 'macd_line', 'macd_signal', 'bollinger_upper', 'bollinger_lower',
+    'sma_20', 'sma_50', 'ema_12', 'ema_26', 'stoch_k', 'stoch_d',
+    'williams_r', 'atr_14', 'adx_14', 'cci_20', 'roc_10',
+    'additional_feature_values', 'target', 'growth_future_7d',
+    'feature_completeness', 'data_quality_score'
+)
+
+# Lightweight table clauses for the save_* INSERTs. Statements built from them are
+# compiled once and reused from SQLAlchemy's compiled cache, and executemany calls
+# go out as multi-row VALUES batches through psycopg2
+ML_MODELS_TABLE = table('ml_models', *(column(name) for name in (
+    'id',
+    'instrument_id', 'model_version', 'model_type', 'model_name', 'hyperparameters',
+    'feature_count', 'target_variable', 'target_horizon_days', 'cv_score',
+    'test_accuracy', 'test_roc_auc', 'test_f1_score', 'validation_roc_auc',
+    'training_records', 'validation_records', 'test_records', 'training_start_date',
+    'training_end_date', 'model_file_path', 'model_file_hash', 'model_size_bytes',
+    'feature_names', 'feature_importance', 'status', 'is_production', 'trained_at',
+    'airflow_dag_id', 'airflow_run_id', 'training_duration_seconds', 'created_by',
+    'additional_feature_names'
+)))
+ML_PREDICTIONS_TABLE = table('ml_predictions', *(column(name) for name in (
+    'model_id', 'instrument_id', 'prediction_date', 'target_date',
+    'prediction_horizon_days', 'trading_date_epoch', 'predicted_class',
+    'prediction_probability', 'prediction_confidence', 'trading_signal',
+    'signal_strength', 'holding_period_days', 'airflow_dag_id', 'airflow_run_id'
+)))
+ML_BACKTEST_RESULTS_TABLE = table('ml_backtest_results', *(column(name) for name in (
+    'model_id', 'instrument_id', 'backtest_start_date', 'backtest_end_date',
+    'holding_period_days', 'probability_threshold', 'initial_capital',
+    'transaction_cost', 'total_return', 'annualized_return', 'sharpe_ratio',
+    'max_drawdown', 'win_rate', 'profit_factor', 'total_trades', 'winning_trades',
+    'losing_trades', 'avg_trade_return', 'best_trade_return', 'worst_trade_return',
+    'volatility', 'var_95', 'calmar_ratio', 'trade_history', 'monthly_returns',
+    'airflow_dag_id', 'airflow_run_id'
+)))
+
+INSERT_MODEL = insert(ML_MODELS_TABLE).returning(ML_MODELS_TABLE.c.id)
+INSERT_PREDICTIONS = insert(ML_PREDICTIONS_TABLE)
+INSERT_BACKTEST = insert(ML_BACKTEST_RESULTS_TABLE)
+UPDATE_FEATURE_NAMES = (
+    update(ML_MODELS_TABLE)
+    .where(ML_MODELS_TABLE.c.id == bindparam('model_id'))
+    .values(additional_feature_names=bindparam('feature_names'))
+)
+
+
+def _dumps(obj: Any) -> str:
+    """
+    Serialize to a JSON string for the JSONB columns
+    
+    Uses orjson when installed (C serializer, numpy scalars/arrays handled
+    natively, NaN/inf written as null); falls back to the stdlib json module.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+def _array_literal(values: List[Any]) -> str:
+    """Format a list as a PostgreSQL array literal for text/CSV COPY (None -> NULL)"""
+    return '{' + ','.join('NULL' if value is None else repr(value) for value in values) + '}'
+
 
 class MLDatabaseOperations:
     """Database operations for ML pipeline artifacts"""
@@ -51,6 +143,48 @@ class MLDatabaseOperations:
         
         # Initialize schema validator for data validation with correct schema
         self.validator = create_validator(schema=self.target_schema, db_host=db_host)
+        
+        # instrument_id -> (fetched_at, model info or None) for get_latest_model
+        self._latest_model_cache = {}
+        
+        # Session shared by save_* calls while a pipeline_session() is open
+        self._active_session = None
+        
+        # Task resolving to the asyncpg pool for the *_async save methods, created on first use
+        self._async_pool = None
+    
+    @contextmanager
+    def pipeline_session(self):
+        """
+        Run several save_* calls in one session and one transaction
+        
+        The transaction commits once when the block exits and rolls back
+        entirely if any call inside it fails. Nested use joins the open session.
+        
+        Example:
+            with ml_db_ops.pipeline_session():
+                model_id = ml_db_ops.save_model_record(...)
+                ml_db_ops.save_feature_data(model_id, ...)
+        """
+        if self._active_session is not None:
+            yield self._active_session
+            return
+        
+        with self.db.get_session() as session:
+            self._active_session = session
+            try:
+                yield session
+            finally:
+                self._active_session = None
+    
+    @contextmanager
+    def _session(self):
+        """Active pipeline session if one is open, otherwise a new session committed on exit"""
+        if self._active_session is not None:
+            yield self._active_session
+        else:
+            with self.db.get_session() as session:
+                yield session
     
     def save_model_record(
         self, 
@@ -85,37 +219,15 @@ class MLDatabaseOperations:
             self.logger.error(error_msg)
             raise ValueError(error_msg)
         
-        with self.db.get_session() as session:
-            result = session.execute(text('''
-                INSERT INTO ml_models (
-                    instrument_id, model_version, model_type, model_name,
-                    hyperparameters, feature_count, target_variable, target_horizon_days,
-                    cv_score, test_accuracy, test_roc_auc, test_f1_score, validation_roc_auc,
-                    training_records, validation_records, test_records,
-                    training_start_date, training_end_date,
-                    model_file_path, model_file_hash, model_size_bytes,
-                    feature_names, feature_importance,
-                    status, is_production, trained_at,
-                    airflow_dag_id, airflow_run_id, training_duration_seconds,
-                    created_by
-                ) VALUES (
-                    :instrument_id, :model_version, :model_type, :model_name,
-                    :hyperparameters, :feature_count, :target_variable, :target_horizon_days,
-                    :cv_score, :test_accuracy, :test_roc_auc, :test_f1_score, :validation_roc_auc,
-                    :training_records, :validation_records, :test_records,
-                    :training_start_date, :training_end_date,
-                    :model_file_path, :model_file_hash, :model_size_bytes,
-                    :feature_names, :feature_importance,
-                    :status, :is_production, :trained_at,
-                    :airflow_dag_id, :airflow_run_id, :training_duration_seconds,
-                    :created_by
-                ) RETURNING id
-            '''), {
+        today = date.today()
+        
+        with self._session() as session:
+            result = session.execute(INSERT_MODEL, {
                 'instrument_id': instrument_id,
                 'model_version': model_version,
                 'model_type': 'xgboost_classifier',
                 'model_name': f"{symbol}_growth_7d_classifier_{model_version}",
-                'hyperparameters': json.dumps(hyperparameters),
+                'hyperparameters': _dumps(hyperparameters),
                 'feature_count': feature_count,
                 'target_variable': 'growth_7d',
                 'target_horizon_days': 7,
@@ -127,13 +239,13 @@ class MLDatabaseOperations:
                 'training_records': training_results.get('train_size', 0),
                 'validation_records': training_results.get('val_size', 0),
                 'test_records': training_results.get('test_size', 0),
-                'training_start_date': (datetime.now() - pd.DateOffset(years=2)).date(),
-                'training_end_date': datetime.now().date(),
+                'training_start_date': today - relativedelta(years=2),
+                'training_end_date': today,
                 'model_file_path': model_file_path,
                 'model_file_hash': model_hash,
                 'model_size_bytes': model_size,
-                'feature_names': json.dumps(training_results.get('feature_names', [])),
-                'feature_importance': json.dumps(training_results.get('feature_importance', {})),
+                'feature_names': _dumps(training_results.get('feature_names', [])),
+                'feature_importance': _dumps(training_results.get('feature_importance', {})),
                 'status': 'active',
                 'is_production': is_production,
                 'trained_at': datetime.now(),
@@ -144,7 +256,9 @@ class MLDatabaseOperations:
             })
             
             model_id = result.fetchone()[0]
-            session.commit()
+            
+            # A new model may supersede the cached latest model for this instrument
+            self._latest_model_cache.pop(instrument_id, None)
             
             self.logger.info(f"✅ Saved model record for {symbol} (model_id: {model_id})")
             return model_id
@@ -162,8 +276,95 @@ class MLDatabaseOperations:
         Returns:
             Number of records saved
         """
+        rows, extra_cols = self._prepare_feature_rows(model_id, instrument_id, feature_df, symbol)
+        
+        with self._session() as session:
+            session.execute(UPDATE_FEATURE_NAMES, {'model_id': model_id, 'feature_names': extra_cols})
+            records_saved = self._copy_rows(session, 'ml_feature_data', FEATURE_DATA_COLUMNS, rows)
+        
+        self.logger.info(f"✅ Saved {records_saved} feature records for {symbol}")
+        return records_saved
+    
+    async def save_feature_data_async(
+        self,
+        model_id: int,
+        instrument_id: int,
+        feature_df: pd.DataFrame,
+        symbol: str
+    ) -> int:
+        """
+        Async variant of save_feature_data using asyncpg's binary COPY
+        
+        Lets a caller overlap the uploads of several symbols on one event loop, e.g.
+        ``await asyncio.gather(*(ops.save_feature_data_async(...) for ... in ...))``.
+        Runs on its own connection pool, so it does not join a pipeline_session().
+        
+        Returns:
+            Number of records saved
+        """
+        if not ASYNCPG_AVAILABLE:
+            raise ImportError("asyncpg is required for save_feature_data_async (pip install asyncpg)")
+        
+        rows, extra_cols = self._prepare_feature_rows(model_id, instrument_id, feature_df, symbol)
+        records = [tuple(row[col] for col in FEATURE_DATA_COLUMNS) for row in rows]
+        
+        pool = await self._get_async_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                f"UPDATE {self.target_schema}.ml_models SET additional_feature_names = $1 WHERE id = $2",
+                extra_cols, model_id
+            )
+            # Command status tag, e.g. "COPY 250"
+            status = await conn.copy_records_to_table(
+                'ml_feature_data',
+                records=records,
+                columns=list(FEATURE_DATA_COLUMNS),
+                schema_name=self.target_schema
+            )
+        
+        records_saved = int(status.split()[-1])
+        self.logger.info(f"✅ Saved {records_saved} feature records for {symbol}")
+        return records_saved
+    
+    async def _get_async_pool(self):
+        """Lazily create the asyncpg pool used by the async save methods"""
+        if self._async_pool is None:
+            config = self.db.config
+            # Keep the creation task so concurrent callers all await the same pool
+            self._async_pool = asyncio.ensure_future(asyncpg.create_pool(
+                host=config.host,
+                port=config.port,
+                database=config.database,
+                user=config.username,
+                password=config.password,
+                min_size=1,
+                max_size=config.pool_size
+            ))
+        return await self._async_pool
+    
+    async def close_async_pool(self) -> None:
+        """Close the asyncpg pool if one was opened"""
+        if self._async_pool is not None:
+            pool = await self._async_pool
+            self._async_pool = None
+            await pool.close()
+    
+    def _prepare_feature_rows(
+        self,
+        model_id: int,
+        instrument_id: int,
+        feature_df: pd.DataFrame,
+        symbol: str
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Validate feature data and build one ml_feature_data row dict per DataFrame row
+        
+        Returns:
+            Tuple of (row dicts keyed by FEATURE_DATA_COLUMNS, extra feature names in the
+            order of each row's additional_feature_values)
+        """
         # Validate feature data before insertion
-        is_valid, errors, cleaned_df = self.validator.validate_feature_data(
+        is_valid, errors, cleaned_df, normalized = self.validator.validate_and_normalize_feature_data(
             feature_df=feature_df,
             model_id=model_id,
             instrument_id=instrument_id
@@ -176,93 +377,93 @@ class MLDatabaseOperations:
         
         # Use cleaned DataFrame for insertion
         feature_df = cleaned_df
-        records_saved = 0
         
-        with self.db.get_session() as session:
-            for _, row in feature_df.iterrows():
-                # Extract key features for individual columns
-                additional_features = {}
-                
-                # Exclude non-numeric metadata columns that shouldn't be stored as features
-                excluded_columns = [
-                    'trading_date_local', 'open_price', 'high_price', 'low_price',
-                    'close_price', 'volume', 'target', 'growth_future_7d',
-                    'rsi_14', 'macd_line', 'macd_signal', 'bollinger_upper', 'bollinger_lower',
-                    'sma_20', 'sma_50', 'ema_12', 'ema_26', 'stoch_k', 'stoch_d',
-                    'williams_r', 'atr_14', 'adx_14', 'cci_20', 'roc_10',
-                    # Exclude metadata columns that are not numeric features
-                    'symbol', 'currency', 'instrument_type', 'exchange', 'market'
-                ]
-                
-                for col in feature_df.columns:
-                    if col not in excluded_columns:
-                        try:
-                            # Only store numeric values
-                            if pd.notnull(row[col]):
-                                additional_features[col] = float(row[col])
-                            else:
-                                additional_features[col] = None
-                        except (ValueError, TypeError):
-                            # Skip columns that can't be converted to float
-                            additional_features[col] = None
-                
-                session.execute(text('''
-                    INSERT INTO ml_feature_data (
-                        model_id, instrument_id, trading_date, trading_date_epoch,
-                        open_price, high_price, low_price, close_price, volume,
-                        rsi_14, macd_line, macd_signal, bollinger_upper, bollinger_lower,
-                        sma_20, sma_50, ema_12, ema_26, stoch_k, stoch_d,
-                        williams_r, atr_14, adx_14, cci_20, roc_10,
-                        additional_features, target, growth_future_7d,
-                        feature_completeness, data_quality_score
-                    ) VALUES (
-                        :model_id, :instrument_id, :trading_date, :trading_date_epoch,
-                        :open_price, :high_price, :low_price, :close_price, :volume,
-                        :rsi_14, :macd_line, :macd_signal, :bollinger_upper, :bollinger_lower,
-                        :sma_20, :sma_50, :ema_12, :ema_26, :stoch_k, :stoch_d,
-                        :williams_r, :atr_14, :adx_14, :cci_20, :roc_10,
-                        :additional_features, :target, :growth_future_7d,
-                        :feature_completeness, :data_quality_score
-                    )
-                '''), {
-                    'model_id': model_id,
-                    'instrument_id': instrument_id,
-                    'trading_date': row['trading_date_local'].date(),
-                    'trading_date_epoch': int(row['trading_date_local'].timestamp()),
-                    'open_price': row.get('open_price'),
-                    'high_price': row.get('high_price'),
-                    'low_price': row.get('low_price'),
-                    'close_price': row.get('close_price'),
-                    'volume': int(row.get('volume', 0)) if pd.notnull(row.get('volume', 0)) and str(row.get('volume', 0)).replace('.', '').isdigit() else 0,
-                    'rsi_14': row.get('rsi_14'),
-                    'macd_line': row.get('macd_line'),
-                    'macd_signal': row.get('macd_signal'),
-                    'bollinger_upper': row.get('bollinger_upper'),
-                    'bollinger_lower': row.get('bollinger_lower'),
-                    'sma_20': row.get('sma_20'),
-                    'sma_50': row.get('sma_50'),
-                    'ema_12': row.get('ema_12'),
-                    'ema_26': row.get('ema_26'),
-                    'stoch_k': row.get('stoch_k'),
-                    'stoch_d': row.get('stoch_d'),
-                    'williams_r': row.get('williams_r'),
-                    'atr_14': row.get('atr_14'),
-                    'adx_14': row.get('adx_14'),
-                    'cci_20': row.get('cci_20'),
-                    'roc_10': row.get('roc_10'),
-                    'additional_features': json.dumps(additional_features),
-                    'target': bool(row.get('target', False)),
-                    'growth_future_7d': row.get('growth_future_7d'),
-                    'feature_completeness': 1 - (row.isnull().sum() / len(row)),
-                    'data_quality_score': 0.95  # Default quality score
-                })
-                
-                records_saved += 1
-            
-            session.commit()
+        # Exclude non-numeric metadata columns that shouldn't be stored as features
+        excluded_columns = [
+            'trading_date_local', 'open_price', 'high_price', 'low_price',
+            'close_price', 'volume', 'target', 'growth_future_7d',
+            'rsi_14', 'macd_line', 'macd_signal', 'bollinger_upper', 'bollinger_lower',
+            'sma_20', 'sma_50', 'ema_12', 'ema_26', 'stoch_k', 'stoch_d',
+            'williams_r', 'atr_14', 'adx_14', 'cci_20', 'roc_10',
+            # Exclude metadata columns that are not numeric features
+            'symbol', 'currency', 'instrument_type', 'exchange', 'market'
+        ]
+        
+        excluded_set = frozenset(excluded_columns)
+        extra_cols = [col for col in feature_df.columns if col not in excluded_set]
+        n_rows = len(feature_df)
+        
+        def column_values(col: str, default=None) -> list:
+            """Column as a list of Python scalars, or the default for every row if absent"""
+            if col in feature_df.columns:
+                return feature_df[col].tolist()
+            return [default] * n_rows
+        
+        # Extra features are stored positionally; their names are saved once per model in
+        # ml_models.additional_feature_names instead of being repeated in every row.
+        # Only finite numeric values are kept; anything else becomes NULL
+        if extra_cols:
+            extras = feature_df[extra_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+            extra_values = extras.astype(object)
+            extra_values[~np.isfinite(extras)] = None
+            additional_feature_values = extra_values.tolist()
+        else:
+            additional_feature_values = [[] for _ in range(n_rows)]
+        
+        trading_dates = feature_df['trading_date_local'].tolist()
+        
+        columns = {
+            'model_id': [model_id] * n_rows,
+            'instrument_id': [instrument_id] * n_rows,
+            'trading_date': [ts.date() for ts in trading_dates],
+            # Epochs, volumes and completeness come precomputed from the validation pass
+            'trading_date_epoch': normalized['trading_date_epoch'].tolist(),
+            'volume': normalized['volume'].tolist(),
+            'additional_feature_values': additional_feature_values,
+            'target': [bool(v) for v in column_values('target', False)],
+            'feature_completeness': normalized['feature_completeness'].tolist(),
+            'data_quality_score': [0.95] * n_rows  # Default quality score
+        }
+        for col in FEATURE_DATA_COLUMNS:
+            if col not in columns:
+                columns[col] = column_values(col)
+        
+        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        return rows, extra_cols
+    
+    def _copy_rows(self, session, table: str, columns: tuple, rows: List[Dict[str, Any]]) -> int:
+        """
+        Stream rows into a table with COPY ... FROM STDIN on the session's connection
+        
+        Args:
+            session: Active SQLAlchemy session (search_path already set)
+            table: Target table name
+            columns: Column names in COPY order
+            rows: Row dicts keyed by column name; None is written as NULL and
+                lists as PostgreSQL array literals
             
-        self.logger.info(f"✅ Saved {records_saved} feature records for {symbol}")
-        return records_saved
+        Returns:
+            Number of rows copied, as reported by the server
+        """
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow([
+                _array_literal(value) if isinstance(value, list) else value
+                for value in (row[col] for col in columns)
+            ])
+        buf.seek(0)
+        
+        # Raw psycopg2 connection bound to the session's current transaction
+        raw_conn = session.connection().connection
+        with raw_conn.cursor() as cur:
+            cur.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV)",
+                buf
+            )
+            copied = cur.rowcount
+        # rowcount is -1 when the driver cannot report it for COPY
+        return copied if copied >= 0 else len(rows)
     
     def save_predictions(
         self,
@@ -294,56 +495,48 @@ class MLDatabaseOperations:
             self.logger.error(error_msg)
             raise ValueError(error_msg)
         
-        predictions_saved = 0
+        probs = np.asarray(probabilities, dtype=np.float64)
+        confidence = np.abs(probs - 0.5) * 2  # Convert to confidence [0,1]
+        signals = np.where(probs > 0.6, 'BUY', np.where(probs < 0.4, 'SELL', 'HOLD'))
         
-        with self.db.get_session() as session:
-            for i, (pred, prob, pred_date) in enumerate(zip(predictions, probabilities, test_dates)):
-                # Handle target date calculation - add 7 days using timedelta
-                if isinstance(pred_date, date):
-                    target_date = pred_date + timedelta(days=7)
-                    # Convert date to datetime for timestamp calculation
-                    pred_datetime = datetime.combine(pred_date, datetime.min.time())
-                    trading_date_epoch = int(pred_datetime.timestamp())
-                else:
-                    # pred_date is already datetime
-                    target_date = (pred_date + timedelta(days=7)).date()
-                    trading_date_epoch = int(pred_date.timestamp())
-                
-                session.execute(text('''
-                    INSERT INTO ml_predictions (
-                        model_id, instrument_id, prediction_date, target_date,
-                        prediction_horizon_days, trading_date_epoch,
-                        predicted_class, prediction_probability, prediction_confidence,
-                        trading_signal, signal_strength, holding_period_days,
-                        airflow_dag_id, airflow_run_id
-                    ) VALUES (
-                        :model_id, :instrument_id, :prediction_date, :target_date,
-                        :prediction_horizon_days, :trading_date_epoch,
-                        :predicted_class, :prediction_probability, :prediction_confidence,
-                        :trading_signal, :signal_strength, :holding_period_days,
-                        :airflow_dag_id, :airflow_run_id
-                    )
-                '''), {
-                    'model_id': model_id,
-                    'instrument_id': instrument_id,
-                    'prediction_date': pred_date,
-                    'target_date': target_date,
-                    'prediction_horizon_days': 7,
-                    'trading_date_epoch': trading_date_epoch,
-                    'predicted_class': bool(pred),
-                    'prediction_probability': float(prob),
-                    'prediction_confidence': abs(float(prob) - 0.5) * 2,  # Convert to confidence [0,1]
-                    'trading_signal': 'BUY' if prob > 0.6 else ('SELL' if prob < 0.4 else 'HOLD'),
-                    'signal_strength': abs(float(prob) - 0.5) * 2,
-                    'holding_period_days': 7,
-                    'airflow_dag_id': airflow_context.get('dag_id'),
-                    'airflow_run_id': airflow_context.get('run_id')
-                })
-                
-                predictions_saved += 1
-            
-            session.commit()
-            
+        prediction_dates = pd.to_datetime(pd.Series(test_dates))
+        # Target date is 7 days after each prediction date
+        target_dates = (prediction_dates + pd.Timedelta(days=7)).dt.date.tolist()
+        # Unix epoch seconds of midnight (UTC) on each prediction date
+        epochs = (
+            prediction_dates.dt.normalize()
+            .to_numpy(dtype='datetime64[s]').astype(np.int64).tolist()
+        )
+        
+        params = [
+            {
+                'model_id': model_id,
+                'instrument_id': instrument_id,
+                'prediction_date': pred_date,
+                'target_date': target_date,
+                'prediction_horizon_days': 7,
+                'trading_date_epoch': epoch,
+                'predicted_class': bool(pred),
+                'prediction_probability': prob,
+                'prediction_confidence': conf,
+                'trading_signal': signal,
+                'signal_strength': conf,
+                'holding_period_days': 7,
+                'airflow_dag_id': airflow_context.get('dag_id'),
+                'airflow_run_id': airflow_context.get('run_id')
+            }
+            for pred, prob, conf, signal, pred_date, target_date, epoch in zip(
+                predictions, probs.tolist(), confidence.tolist(), signals.tolist(),
+                test_dates, target_dates, epochs
+            )
+        ]
+        
+        with self._session() as session:
+            # executemany in fixed-size chunks: one call per chunk instead of per prediction
+            for start in range(0, len(params), INSERT_BATCH_SIZE):
+                session.execute(INSERT_PREDICTIONS, params[start:start + INSERT_BATCH_SIZE])
+        
+        predictions_saved = len(params)
         self.logger.info(f"✅ Saved {predictions_saved} predictions for {symbol}")
         return predictions_saved
     
@@ -370,34 +563,14 @@ class MLDatabaseOperations:
             self.logger.error(error_msg)
             raise ValueError(error_msg)
         
-        with self.db.get_session() as session:
-            session.execute(text('''
-                INSERT INTO ml_backtest_results (
-                    model_id, instrument_id, backtest_start_date, backtest_end_date,
-                    holding_period_days, probability_threshold, initial_capital, transaction_cost,
-                    total_return, annualized_return, sharpe_ratio, max_drawdown, win_rate, profit_factor,
-                    total_trades, winning_trades, losing_trades,
-                    avg_trade_return, best_trade_return, worst_trade_return,
-                    volatility, var_95, calmar_ratio,
-                    trade_history, monthly_returns,
-                    backtest_quality, quality_score,
-                    airflow_dag_id, airflow_run_id
-                ) VALUES (
-                    :model_id, :instrument_id, :backtest_start_date, :backtest_end_date,
-                    :holding_period_days, :probability_threshold, :initial_capital, :transaction_cost,
-                    :total_return, :annualized_return, :sharpe_ratio, :max_drawdown, :win_rate, :profit_factor,
-                    :total_trades, :winning_trades, :losing_trades,
-                    :avg_trade_return, :best_trade_return, :worst_trade_return,
-                    :volatility, :var_95, :calmar_ratio,
-                    :trade_history, :monthly_returns,
-                    :backtest_quality, :quality_score,
-                    :airflow_dag_id, :airflow_run_id
-                )
-            '''), {
+        today = date.today()
+        
+        with self._session() as session:
+            session.execute(INSERT_BACKTEST, {
                 'model_id': model_id,
                 'instrument_id': instrument_id,
-                'backtest_start_date': (datetime.now() - pd.DateOffset(years=1)).date(),
-                'backtest_end_date': datetime.now().date(),
+                'backtest_start_date': today - relativedelta(years=1),
+                'backtest_end_date': today,
                 'holding_period_days': 7,
                 'probability_threshold': 0.6,
                 'initial_capital': 10000.00,
@@ -417,72 +590,65 @@ class MLDatabaseOperations:
                 'volatility': backtest_results.get('volatility', 0),
                 'var_95': backtest_results.get('var_95', 0),
                 'calmar_ratio': backtest_results.get('calmar_ratio', 0),
-                'trade_history': json.dumps(backtest_results.get('trades', [])),
-                'monthly_returns': json.dumps(backtest_results.get('monthly_returns', {})),
-                'backtest_quality': self._assess_backtest_quality(backtest_results),
-                'quality_score': self._calculate_quality_score(backtest_results),
+                'trade_history': _dumps(backtest_results.get('trades', [])),
+                'monthly_returns': _dumps(backtest_results.get('monthly_returns', {})),
                 'airflow_dag_id': airflow_context.get('dag_id'),
                 'airflow_run_id': airflow_context.get('run_id')
             })
             
-            session.commit()
-            
         self.logger.info(f"✅ Saved backtesting results for {symbol}")
     
-    def _assess_backtest_quality(self, results: Dict) -> str:
-        """Assess backtest quality based on performance metrics"""
-        total_return = results.get('total_return', 0)
-        sharpe_ratio = results.get('sharpe_ratio', 0)
-        win_rate = results.get('win_rate', 0)
-        total_trades = results.get('total_trades', 0)
-        
-        if total_return > 0.15 and sharpe_ratio > 1.0 and win_rate > 0.55 and total_trades > 10:
-            return 'EXCELLENT'
-        elif total_return > 0.10 and sharpe_ratio > 0.5 and win_rate > 0.50 and total_trades > 5:
-            return 'GOOD'
-        elif total_return > 0.05 and total_trades > 3:
-            return 'FAIR'
+    def get_latest_model(self, instrument_id: int) -> Optional[Dict]:
+        """Get latest active model for an instrument (cached for LATEST_MODEL_CACHE_TTL seconds)"""
+        cached = self._latest_model_cache.get(instrument_id)
+        if cached is not None and time.monotonic() - cached[0] < LATEST_MODEL_CACHE_TTL:
+            model = cached[1]
         else:
-            return 'POOR'
+            model = self.get_latest_models([instrument_id]).get(instrument_id)
+        return dict(model) if model else None
     
-    def _calculate_quality_score(self, results: Dict) -> float:
-        """Calculate overall quality score [0,1]"""
-        total_return = results.get('total_return', 0)
-        sharpe_ratio = results.get('sharpe_ratio', 0)
-        win_rate = results.get('win_rate', 0)
-        
-        # Weighted combination of metrics
-        score = (
-            min(1.0, max(0.0, total_return * 2)) * 0.4 +  # Total return (capped at 50%)
-            min(1.0, max(0.0, sharpe_ratio / 2)) * 0.3 +   # Sharpe ratio (capped at 2.0)
-            min(1.0, max(0.0, win_rate)) * 0.3              # Win rate
-        )
+    def get_latest_models(self, instrument_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Get latest active model for several instruments in a single query
+        
+        Args:
+            instrument_ids: Instruments to look up
+            
+        Returns:
+            Dict mapping instrument_id to model info; instruments without an active
+            production model are omitted
+        """
+        ids = list(dict.fromkeys(int(instrument_id) for instrument_id in instrument_ids))
+        if not ids:
+            return {}
         
-        return round(score, 4)
-    
-    def get_latest_model(self, instrument_id: int) -> Optional[Dict]:
-        """Get latest active model for an instrument"""
         with self.db.get_session() as session:
             result = session.execute(text('''
-                SELECT id, model_version, trained_at, test_roc_auc, model_file_path
+                SELECT DISTINCT ON (instrument_id)
+                    instrument_id, id, model_version, trained_at, test_roc_auc, model_file_path
                 FROM ml_models 
-                WHERE instrument_id = :instrument_id 
+                WHERE instrument_id = ANY(:instrument_ids)
                   AND status = 'active'
                   AND is_production = true
-                ORDER BY trained_at DESC
-                LIMIT 1
-            '''), {'instrument_id': instrument_id})
+                ORDER BY instrument_id, trained_at DESC
+            '''), {'instrument_ids': ids})
             
-            row = result.fetchone()
-            if row:
-                return {
-                    'model_id': row[0],
-                    'model_version': row[1], 
-                    'trained_at': row[2],
-                    'test_roc_auc': row[3],
-                    'model_file_path': row[4]
+            models = {
+                row[0]: {
+                    'model_id': row[1],
+                    'model_version': row[2], 
+                    'trained_at': row[3],
+                    'test_roc_auc': row[4],
+                    'model_file_path': row[5]
                 }
-            return None
+                for row in result.fetchall()
+            }
+        
+        fetched_at = time.monotonic()
+        for instrument_id in ids:
+            self._latest_model_cache[instrument_id] = (fetched_at, models.get(instrument_id))
+        
+        return {instrument_id: dict(model) for instrument_id, model in models.items()}
     
     def update_prediction_actuals(self, days_back: int = 7) -> int:
         """
@@ -494,62 +660,26 @@ class MLDatabaseOperations:
         Returns:
             Number of predictions updated
         """
-        updated_count = 0
-        
         with self.db.get_session() as session:
-            # Find predictions that need actual outcome updates
+            # Join pending predictions to the target-date and +7-day prices and fill in
+            # the actual outcome in one statement
             result = session.execute(text('''
-                SELECT p.id, p.instrument_id, p.target_date, p.predicted_class
-                FROM ml_predictions p
-                WHERE p.target_date = CURRENT_DATE - INTERVAL '%s days'
+                UPDATE ml_predictions p
+                SET actual_class = (sp2.close_price / sp1.close_price) > 1.0,
+                    actual_return_7d = (sp2.close_price - sp1.close_price) / sp1.close_price,
+                    actual_growth_7d = sp2.close_price / sp1.close_price,
+                    prediction_accuracy = p.predicted_class = ((sp2.close_price / sp1.close_price) > 1.0),
+                    updated_at = CURRENT_TIMESTAMP
+                FROM stock_prices sp1
+                JOIN stock_prices sp2 ON sp2.stock_id = sp1.stock_id
+                    AND sp2.trading_date_local = sp1.trading_date_local + INTERVAL '7 days'
+                WHERE sp1.stock_id = p.instrument_id
+                  AND sp1.trading_date_local = p.target_date
+                  AND p.target_date = CURRENT_DATE - CAST(:days_back AS INTEGER)
                   AND p.actual_class IS NULL
-            '''), (days_back,))
-            
-            for row in result.fetchall():
-                pred_id, instrument_id, target_date, predicted_class = row
-                
-                # Get actual price data for the target date and 7 days later
-                price_result = session.execute(text('''
-                    SELECT 
-                        sp1.close_price as start_price,
-                        sp2.close_price as end_price
-                    FROM stock_prices sp1
-                    JOIN stock_prices sp2 ON sp2.stock_id = sp1.stock_id
-                        AND sp2.trading_date_local = sp1.trading_date_local + INTERVAL '7 days'
-                    WHERE sp1.stock_id = :instrument_id
-                      AND sp1.trading_date_local = :target_date
-                '''), {
-                    'instrument_id': instrument_id,
-                    'target_date': target_date
-                })
-                
-                price_row = price_result.fetchone()
-                if price_row:
-                    start_price, end_price = price_row
-                    actual_growth = end_price / start_price
-                    actual_return = (end_price - start_price) / start_price
-                    actual_class = actual_growth > 1.0
-                    prediction_accuracy = predicted_class == actual_class
-                    
-                    # Update the prediction record
-                    session.execute(text('''
-                        UPDATE ml_predictions 
-                        SET actual_class = :actual_class,
-                            actual_return_7d = :actual_return,
-                            actual_growth_7d = :actual_growth,
-                            prediction_accuracy = :prediction_accuracy,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = :pred_id
-                    '''), {
-                        'actual_class': actual_class,
-                        'actual_return': actual_return,
-                        'actual_growth': actual_growth,
-                        'prediction_accuracy': prediction_accuracy,
-                        'pred_id': pred_id
-                    })
-                    
-                    updated_count += 1
+            '''), {'days_back': days_back})
             
+            updated_count = result.rowcount
             session.commit()
             
         self.logger.info(f"✅ Updated {updated_count} prediction actuals")
@@ -6,10 +6,13 @@ Implements comprehensive feature generation from close price and volume data.
 import pandas as pd
 import numpy as np
 import warnings
+import hashlib
+import importlib.util
 from typing import Dict, List, Optional, Tuple
 import logging
 from datetime import datetime
 from pathlib import Path
+from joblib import Parallel, delayed
 from scipy.stats import chi2_contingency, f_oneway, pointbiserialr, boxcox
 from scipy import signal
 from scipy.fftpack import dct, idct
@@ -164,12 +167,34 @@ except ImportError:
     TALIB_AVAILABLE = False
     logger.warning("TA-Lib not available. Using basic indicators only.")
 
+# Parquet engine for the engineered-feature cache (optional)
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Fingerprint of this module's source: part of the feature cache key, so any change to the
+# indicator code invalidates previously cached features instead of silently reusing them
+FEATURE_CODE_DIGEST = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+
 
 class StockFeatureEngineer:
     """Feature engineering pipeline for stock data"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: Directory for cached engineered features keyed by (symbol, data hash);
+                None disables the cache
+        """
         self.feature_names = []
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None and not PARQUET_AVAILABLE:
+            logger.warning("pyarrow not available. Feature cache disabled.")
+            self.cache_dir = None
+        
+    def _feature_cache_path(self, df: pd.DataFrame, symbol: str) -> Path:
+        """Cache file for this symbol's raw input, keyed by a content hash of the data and the feature code"""
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+        digest.update(f"{symbol}|talib={TALIB_AVAILABLE}|code={FEATURE_CODE_DIGEST}".encode())
+        return self.cache_dir / f"{symbol}_{digest.hexdigest()[:16]}.parquet"
         
     def create_target_variable(self, df: pd.DataFrame, target_days: int = 7) -> pd.DataFrame:
         """
@@ -180,10 +205,8 @@ class StockFeatureEngineer:
             target_days: Number of days to look ahead (default: 7 for weekly prediction)
             
         Returns:
-            DataFrame with target variable added
+            The same DataFrame with the target variable added (modified in place)
         """
-        df = df.copy()
-        
         # 7-day forward growth rate (more predictable than 30-day)
         df[f'growth_future_{target_days}d'] = df['close_price'].shift(-target_days) / df['close_price']
         
@@ -198,158 +221,160 @@ class StockFeatureEngineer:
         
         return df
         
+    def _with_columns(self, df: pd.DataFrame, columns: Dict[str, object]) -> pd.DataFrame:
+        """
+        Attach a stage's newly computed columns to df in a single concat
+        
+        Inserting columns one by one re-allocates the frame's column blocks on every
+        assignment; building them up front and joining once avoids that. Columns that
+        already exist in df are replaced.
+        """
+        overlap = df.columns.intersection(list(columns))
+        if len(overlap):
+            df = df.drop(columns=overlap)
+        return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+        
     def create_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Generate time-based features from date"""
-        df = df.copy()
-        
         # Ensure datetime format
-        df['trading_date_local'] = pd.to_datetime(df['trading_date_local'])
-        
-        df['year'] = df['trading_date_local'].dt.year
-        df['month'] = df['trading_date_local'].dt.month
-        df['weekday'] = df['trading_date_local'].dt.weekday  # Monday=0, Sunday=6
-        df['quarter'] = df['trading_date_local'].dt.quarter
-        df['day_of_year'] = df['trading_date_local'].dt.dayofyear
-        df['week_of_year'] = df['trading_date_local'].dt.isocalendar().week
-        
-        # Market timing features
-        df['is_month_end'] = (df['trading_date_local'].dt.day >= 25).astype(int)
-        df['is_quarter_end'] = df['trading_date_local'].dt.month.isin([3, 6, 9, 12]).astype(int)
-        df['is_year_end'] = (df['trading_date_local'].dt.month == 12).astype(int)
-        
-        time_features = ['year', 'month', 'weekday', 'quarter', 'day_of_year', 
-                        'week_of_year', 'is_month_end', 'is_quarter_end', 'is_year_end']
+        dates = pd.to_datetime(df['trading_date_local'])
+        dt = dates.dt
+        
+        time_features = {
+            'year': dt.year,
+            'month': dt.month,
+            'weekday': dt.weekday,  # Monday=0, Sunday=6
+            'quarter': dt.quarter,
+            'day_of_year': dt.dayofyear,
+            'week_of_year': dt.isocalendar().week,
+            
+            # Market timing features
+            'is_month_end': (dt.day >= 25).astype(int),
+            'is_quarter_end': dt.month.isin([3, 6, 9, 12]).astype(int),
+            'is_year_end': (dt.month == 12).astype(int),
+        }
+        
+        df = self._with_columns(df, time_features)
+        df['trading_date_local'] = dates
         
         logger.debug(f"Created {len(time_features)} time-based features")
         return df
         
     def create_growth_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Generate historical growth rate features"""
-        df = df.copy()
+        close = df['close_price']
         
         growth_periods = [1, 3, 7, 14, 30, 60, 90, 180, 365]
-        
-        for period in growth_periods:
-            df[f'growth_{period}d'] = df['close_price'] / df['close_price'].shift(period)
+        growth_features = {f'growth_{period}d': close / close.shift(period) for period in growth_periods}
             
         # Growth momentum features
-        df['growth_acceleration_7d'] = df['growth_7d'] - df['growth_14d']
-        df['growth_acceleration_30d'] = df['growth_30d'] - df['growth_60d']
-        
-        growth_features = [f'growth_{p}d' for p in growth_periods] + \
-                         ['growth_acceleration_7d', 'growth_acceleration_30d']
+        growth_features['growth_acceleration_7d'] = growth_features['growth_7d'] - growth_features['growth_14d']
+        growth_features['growth_acceleration_30d'] = growth_features['growth_30d'] - growth_features['growth_60d']
         
         logger.debug(f"Created {len(growth_features)} growth-based features")
-        return df
+        return self._with_columns(df, growth_features)
         
     def create_price_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Generate technical indicators from close price"""
-        df = df.copy()
+        close = df['close_price']
+        price_features = {}
         
         # Simple Moving Averages
         ma_periods = [5, 10, 20, 50, 100, 200]
         for period in ma_periods:
-            df[f'sma_{period}'] = df['close_price'].rolling(period).mean()
+            price_features[f'sma_{period}'] = close.rolling(period).mean()
             
         # Exponential Moving Averages
         ema_periods = [12, 26, 50]
         for period in ema_periods:
-            df[f'ema_{period}'] = df['close_price'].ewm(span=period).mean()
+            price_features[f'ema_{period}'] = close.ewm(span=period).mean()
+        
+        sma_10, sma_20 = price_features['sma_10'], price_features['sma_20']
+        sma_50, sma_200 = price_features['sma_50'], price_features['sma_200']
             
         # Price relative to moving averages
-        df['price_to_sma_20'] = df['close_price'] / df['sma_20']
-        df['price_to_sma_50'] = df['close_price'] / df['sma_50']
-        df['price_to_sma_200'] = df['close_price'] / df['sma_200']
+        price_features['price_to_sma_20'] = close / sma_20
+        price_features['price_to_sma_50'] = close / sma_50
+        price_features['price_to_sma_200'] = close / sma_200
         
         # Moving average crossover signals
-        df['sma_10_above_20'] = (df['sma_10'] > df['sma_20']).astype(int)
-        df['sma_20_above_50'] = (df['sma_20'] > df['sma_50']).astype(int)
-        df['sma_50_above_200'] = (df['sma_50'] > df['sma_200']).astype(int)
-        df['price_above_sma_20'] = (df['close_price'] > df['sma_20']).astype(int)
-        df['price_above_sma_50'] = (df['close_price'] > df['sma_50']).astype(int)
+        price_features['sma_10_above_20'] = (sma_10 > sma_20).astype(int)
+        price_features['sma_20_above_50'] = (sma_20 > sma_50).astype(int)
+        price_features['sma_50_above_200'] = (sma_50 > sma_200).astype(int)
+        price_features['price_above_sma_20'] = (close > sma_20).astype(int)
+        price_features['price_above_sma_50'] = (close > sma_50).astype(int)
         
         # Returns and volatility
-        df['daily_return'] = df['close_price'].pct_change()
-        df['daily_return_squared'] = df['daily_return'] ** 2
+        daily_return = close.pct_change()
+        price_features['daily_return'] = daily_return
+        price_features['daily_return_squared'] = daily_return ** 2
         
         # Rolling volatility (different periods)
         vol_periods = [5, 10, 20, 30, 60]
         for period in vol_periods:
-            df[f'volatility_{period}d'] = df['daily_return'].rolling(period).std() * np.sqrt(252)
-            df[f'return_mean_{period}d'] = df['daily_return'].rolling(period).mean()
+            return_window = daily_return.rolling(period)
+            price_features[f'volatility_{period}d'] = return_window.std() * np.sqrt(252)
+            price_features[f'return_mean_{period}d'] = return_window.mean()
             
         # Price momentum
-        df['price_momentum_5d'] = df['close_price'] - df['close_price'].shift(5)
-        df['price_momentum_20d'] = df['close_price'] - df['close_price'].shift(20)
+        price_features['price_momentum_5d'] = close - close.shift(5)
+        price_features['price_momentum_20d'] = close - close.shift(20)
         
         # Price position in recent range
-        df['price_position_20d'] = (df['close_price'] - df['close_price'].rolling(20).min()) / \
-                                 (df['close_price'].rolling(20).max() - df['close_price'].rolling(20).min())
-        df['price_position_60d'] = (df['close_price'] - df['close_price'].rolling(60).min()) / \
-                                 (df['close_price'].rolling(60).max() - df['close_price'].rolling(60).min())
-        
-        price_features = [f'sma_{p}' for p in ma_periods] + \
-                        [f'ema_{p}' for p in ema_periods] + \
-                        ['price_to_sma_20', 'price_to_sma_50', 'price_to_sma_200',
-                         'sma_10_above_20', 'sma_20_above_50', 'sma_50_above_200',
-                         'price_above_sma_20', 'price_above_sma_50',
-                         'daily_return', 'daily_return_squared'] + \
-                        [f'volatility_{p}d' for p in vol_periods] + \
-                        [f'return_mean_{p}d' for p in vol_periods] + \
-                        ['price_momentum_5d', 'price_momentum_20d',
-                         'price_position_20d', 'price_position_60d']
+        for window in (20, 60):
+            price_window = close.rolling(window)
+            rolling_min = price_window.min()
+            price_features[f'price_position_{window}d'] = (close - rolling_min) / (price_window.max() - rolling_min)
         
         logger.debug(f"Created {len(price_features)} price-based features")
-        return df
+        return self._with_columns(df, price_features)
         
     def create_volume_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Generate volume-based indicators"""
-        df = df.copy()
+        volume = df['volume']
+        daily_return = df['daily_return']
+        volume_features = {}
         
         # Volume moving averages
         vol_ma_periods = [5, 10, 20, 50]
         for period in vol_ma_periods:
-            df[f'volume_ma_{period}'] = df['volume'].rolling(period).mean()
+            volume_features[f'volume_ma_{period}'] = volume.rolling(period).mean()
+        
+        volume_ma_10, volume_ma_20 = volume_features['volume_ma_10'], volume_features['volume_ma_20']
             
         # Volume relative to averages
-        df['volume_ratio_10d'] = df['volume'] / df['volume_ma_10']
-        df['volume_ratio_20d'] = df['volume'] / df['volume_ma_20']
-        df['volume_ratio_50d'] = df['volume'] / df['volume_ma_50']
+        volume_features['volume_ratio_10d'] = volume / volume_ma_10
+        volume_features['volume_ratio_20d'] = volume / volume_ma_20
+        volume_features['volume_ratio_50d'] = volume / volume_features['volume_ma_50']
         
         # Volume trend indicators
-        df['volume_increasing_10d'] = (df['volume'] > df['volume_ma_10']).astype(int)
-        df['volume_increasing_20d'] = (df['volume'] > df['volume_ma_20']).astype(int)
+        volume_features['volume_increasing_10d'] = (volume > volume_ma_10).astype(int)
+        volume_features['volume_increasing_20d'] = (volume > volume_ma_20).astype(int)
         
         # Price-volume relationship
-        df['price_volume_trend_5d'] = (df['daily_return'] * df['volume']).rolling(5).mean()
-        df['price_volume_trend_20d'] = (df['daily_return'] * df['volume']).rolling(20).mean()
+        price_volume = daily_return * volume
+        volume_features['price_volume_trend_5d'] = price_volume.rolling(5).mean()
+        volume_features['price_volume_trend_20d'] = price_volume.rolling(20).mean()
         
         # Volume momentum
-        df['volume_momentum_5d'] = df['volume'] - df['volume'].shift(5)
-        df['volume_momentum_20d'] = df['volume'] - df['volume'].shift(20)
+        volume_features['volume_momentum_5d'] = volume - volume.shift(5)
+        volume_features['volume_momentum_20d'] = volume - volume.shift(20)
         
         # Volume volatility
-        df['volume_volatility_20d'] = df['volume'].rolling(20).std() / df['volume_ma_20']
+        volume_features['volume_volatility_20d'] = volume.rolling(20).std() / volume_ma_20
         
-        # On-Balance Volume (OBV) approximation
-        df['obv_approx'] = np.where(df['daily_return'] > 0, df['volume'], 
-                                   np.where(df['daily_return'] < 0, -df['volume'], 0)).cumsum()
-        df['obv_ma_20'] = df['obv_approx'].rolling(20).mean()
-        
-        volume_features = [f'volume_ma_{p}' for p in vol_ma_periods] + \
-                         ['volume_ratio_10d', 'volume_ratio_20d', 'volume_ratio_50d',
-                          'volume_increasing_10d', 'volume_increasing_20d',
-                          'price_volume_trend_5d', 'price_volume_trend_20d',
-                          'volume_momentum_5d', 'volume_momentum_20d', 'volume_volatility_20d',
-                          'obv_approx', 'obv_ma_20']
+        # On-Balance Volume (OBV) approximation: signed volume (flat or missing return -> 0)
+        volume_values = volume.to_numpy()
+        direction = np.sign(np.nan_to_num(daily_return.to_numpy(dtype=np.float64), nan=0.0))
+        obv_approx = pd.Series(np.cumsum(direction.astype(volume_values.dtype) * volume_values), index=df.index)
+        volume_features['obv_approx'] = obv_approx
+        volume_features['obv_ma_20'] = obv_approx.rolling(20).mean()
         
         logger.debug(f"Created {len(volume_features)} volume-based features")
-        return df
+        return self._with_columns(df, volume_features)
     
     def create_logarithmic_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate logarithmic transformations for financial stability"""
-        df = df.copy()
-        
+        """Generate logarithmic transformations for financial stability (adds columns to df in place and returns it)"""
         # Log returns (more stable than simple returns)
         df['log_return_1d'] = np.log(df['close_price'] / df['close_price'].shift(1))
         df['log_return_5d'] = np.log(df['close_price'] / df['close_price'].shift(5))
@@ -412,9 +437,7 @@ class StockFeatureEngineer:
         return df
     
     def create_spectral_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate Fourier transform and spectral analysis features"""
-        df = df.copy()
-        
+        """Generate Fourier transform and spectral analysis features (adds columns to df in place and returns it)"""
         def compute_fft_features(price_series, window=60):
             """Compute Fast Fourier Transform features for price series"""
             if len(price_series) < window or price_series.isna().any():
@@ -584,9 +607,7 @@ class StockFeatureEngineer:
         return df
         
     def simulate_ohlc_from_close(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create estimated OHLC data from close prices for TA-Lib compatibility"""
-        df = df.copy()
-        
+        """Create estimated OHLC data from close prices for TA-Lib compatibility (adds columns to df in place and returns it)"""
         # Use previous close as open (gap-less assumption)
         df['open_price'] = df['close_price'].shift(1)
         
@@ -614,107 +635,102 @@ class StockFeatureEngineer:
         return df
         
     def create_talib_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate TA-Lib technical indicators (if available)"""
+        """Generate TA-Lib technical indicators (if available); simulated OHLC columns are added to df in place when missing"""
         if not TALIB_AVAILABLE:
             logger.warning("TA-Lib not available, skipping advanced indicators")
             return df
             
-        df = df.copy()
-        
         # Ensure we have OHLC data
         if 'open_price' not in df.columns:
             df = self.simulate_ohlc_from_close(df)
             
-        # Convert to numpy arrays for TA-Lib (ensure float64 type)
-        high = df['high_price'].astype('float64').values
-        low = df['low_price'].astype('float64').values
-        close = df['close_price'].astype('float64').values
-        volume = df['volume'].astype('float64').values
-        open_price = df['open_price'].astype('float64').values
+        # Convert once to contiguous float64 arrays shared by every TA-Lib call (no internal copies)
+        high = np.ascontiguousarray(df['high_price'], dtype=np.float64)
+        low = np.ascontiguousarray(df['low_price'], dtype=np.float64)
+        close = np.ascontiguousarray(df['close_price'], dtype=np.float64)
+        volume = np.ascontiguousarray(df['volume'], dtype=np.float64)
+        open_price = np.ascontiguousarray(df['open_price'], dtype=np.float64)
+        
+        # Indicator outputs are collected here and attached in one concat
+        talib_features = {}
         
         try:
             # Momentum Indicators
-            df['rsi_14'] = talib.RSI(close, timeperiod=14)
-            df['rsi_7'] = talib.RSI(close, timeperiod=7)
+            talib_features['rsi_14'] = talib.RSI(close, timeperiod=14)
+            talib_features['rsi_7'] = talib.RSI(close, timeperiod=7)
             
             # MACD
-            df['macd'], df['macd_signal'], df['macd_hist'] = talib.MACD(close)
+            talib_features['macd'], talib_features['macd_signal'], talib_features['macd_hist'] = talib.MACD(close)
             
             # Stochastic
-            df['stoch_k'], df['stoch_d'] = talib.STOCH(high, low, close)
-            df['stoch_rsi_k'], df['stoch_rsi_d'] = talib.STOCHRSI(close, timeperiod=14)
+            talib_features['stoch_k'], talib_features['stoch_d'] = talib.STOCH(high, low, close)
+            talib_features['stoch_rsi_k'], talib_features['stoch_rsi_d'] = talib.STOCHRSI(close, timeperiod=14)
             
             # Williams %R
-            df['williams_r'] = talib.WILLR(high, low, close, timeperiod=14)
+            talib_features['williams_r'] = talib.WILLR(high, low, close, timeperiod=14)
             
             # ADX (Average Directional Index)
-            df['adx'] = talib.ADX(high, low, close, timeperiod=14)
-            df['plus_di'] = talib.PLUS_DI(high, low, close, timeperiod=14)
-            df['minus_di'] = talib.MINUS_DI(high, low, close, timeperiod=14)
+            talib_features['adx'] = talib.ADX(high, low, close, timeperiod=14)
+            talib_features['plus_di'] = talib.PLUS_DI(high, low, close, timeperiod=14)
+            talib_features['minus_di'] = talib.MINUS_DI(high, low, close, timeperiod=14)
             
             # CCI (Commodity Channel Index)
-            df['cci'] = talib.CCI(high, low, close, timeperiod=14)
+            talib_features['cci'] = talib.CCI(high, low, close, timeperiod=14)
             
             # CMO (Chande Momentum Oscillator)
-            df['cmo'] = talib.CMO(close, timeperiod=14)
+            talib_features['cmo'] = talib.CMO(close, timeperiod=14)
             
             # ROC (Rate of Change)
-            df['roc_10'] = talib.ROC(close, timeperiod=10)
-            df['roc_20'] = talib.ROC(close, timeperiod=20)
+            talib_features['roc_10'] = talib.ROC(close, timeperiod=10)
+            talib_features['roc_20'] = talib.ROC(close, timeperiod=20)
             
             # MOM (Momentum)
-            df['momentum_10'] = talib.MOM(close, timeperiod=10)
+            talib_features['momentum_10'] = talib.MOM(close, timeperiod=10)
             
             # Volatility Indicators
-            df['atr'] = talib.ATR(high, low, close, timeperiod=14)
-            df['natr'] = talib.NATR(high, low, close, timeperiod=14)
+            talib_features['atr'] = talib.ATR(high, low, close, timeperiod=14)
+            talib_features['natr'] = talib.NATR(high, low, close, timeperiod=14)
             
             # Bollinger Bands
-            df['bb_upper'], df['bb_middle'], df['bb_lower'] = talib.BBANDS(close)
-            df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle']
-            df['bb_position'] = (close - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+            bb_upper, bb_middle, bb_lower = talib.BBANDS(close)
+            talib_features['bb_upper'] = bb_upper
+            talib_features['bb_middle'] = bb_middle
+            talib_features['bb_lower'] = bb_lower
+            talib_features['bb_width'] = (bb_upper - bb_lower) / bb_middle
+            talib_features['bb_position'] = (close - bb_lower) / (bb_upper - bb_lower)
             
             # Volume Indicators
-            df['obv'] = talib.OBV(close, volume)
-            df['ad_line'] = talib.AD(high, low, close, volume)
-            df['mfi'] = talib.MFI(high, low, close, volume, timeperiod=14)
+            talib_features['obv'] = talib.OBV(close, volume)
+            talib_features['ad_line'] = talib.AD(high, low, close, volume)
+            talib_features['mfi'] = talib.MFI(high, low, close, volume, timeperiod=14)
             
             # Price Transform Indicators
-            df['typical_price'] = talib.TYPPRICE(high, low, close)
-            df['weighted_close'] = talib.WCLPRICE(high, low, close)
-            df['median_price'] = talib.MEDPRICE(high, low)
+            talib_features['typical_price'] = talib.TYPPRICE(high, low, close)
+            talib_features['weighted_close'] = talib.WCLPRICE(high, low, close)
+            talib_features['median_price'] = talib.MEDPRICE(high, low)
             
             # Overlap Studies (additional moving averages)
-            df['dema_20'] = talib.DEMA(close, timeperiod=20)
-            df['tema_20'] = talib.TEMA(close, timeperiod=20)
-            df['trima_20'] = talib.TRIMA(close, timeperiod=20)
+            talib_features['dema_20'] = talib.DEMA(close, timeperiod=20)
+            talib_features['tema_20'] = talib.TEMA(close, timeperiod=20)
+            talib_features['trima_20'] = talib.TRIMA(close, timeperiod=20)
             
             # Pattern Recognition (selected patterns)
-            df['cdl_doji'] = talib.CDLDOJI(open_price, high, low, close)
-            df['cdl_hammer'] = talib.CDLHAMMER(open_price, high, low, close)
-            df['cdl_engulfing'] = talib.CDLENGULFING(open_price, high, low, close)
-            df['cdl_morning_star'] = talib.CDLMORNINGSTAR(open_price, high, low, close)
-            df['cdl_evening_star'] = talib.CDLEVENINGSTAR(open_price, high, low, close)
-            
-            talib_features = ['rsi_14', 'rsi_7', 'macd', 'macd_signal', 'macd_hist',
-                             'stoch_k', 'stoch_d', 'stoch_rsi_k', 'stoch_rsi_d', 'williams_r',
-                             'adx', 'plus_di', 'minus_di', 'cci', 'cmo', 'roc_10', 'roc_20',
-                             'momentum_10', 'atr', 'natr', 'bb_upper', 'bb_middle', 'bb_lower',
-                             'bb_width', 'bb_position', 'obv', 'ad_line', 'mfi',
-                             'typical_price', 'weighted_close', 'median_price',
-                             'dema_20', 'tema_20', 'trima_20',
-                             'cdl_doji', 'cdl_hammer', 'cdl_engulfing', 'cdl_morning_star', 'cdl_evening_star']
+            talib_features['cdl_doji'] = talib.CDLDOJI(open_price, high, low, close)
+            talib_features['cdl_hammer'] = talib.CDLHAMMER(open_price, high, low, close)
+            talib_features['cdl_engulfing'] = talib.CDLENGULFING(open_price, high, low, close)
+            talib_features['cdl_morning_star'] = talib.CDLMORNINGSTAR(open_price, high, low, close)
+            talib_features['cdl_evening_star'] = talib.CDLEVENINGSTAR(open_price, high, low, close)
             
             logger.debug(f"Created {len(talib_features)} TA-Lib features")
             
         except Exception as e:
             logger.error(f"Error creating TA-Lib features: {e}")
-            
-        return df
+        
+        # Indicators computed before a failure are still kept
+        return self._with_columns(df, talib_features)
         
     def create_chaos_theory_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate chaos theory and nonlinear dynamics features"""
-        df = df.copy()
+        """Generate chaos theory and nonlinear dynamics features (adds columns to df in place and returns it)"""
         close = df['close_price'].values
         
         try:
@@ -922,8 +938,7 @@ class StockFeatureEngineer:
         return df
     
     def create_thermodynamics_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate thermodynamics-inspired features for market dynamics"""
-        df = df.copy()
+        """Generate thermodynamics-inspired features for market dynamics (adds columns to df in place and returns it)"""
         close = df['close_price'].values
         volume = df['volume'].values
         
@@ -1072,8 +1087,7 @@ class StockFeatureEngineer:
         return df
     
     def create_wave_physics_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate wave physics and electromagnetic features"""
-        df = df.copy()
+        """Generate wave physics and electromagnetic features (adds columns to df in place and returns it)"""
         close = df['close_price'].values
         volume = df['volume'].values
         
@@ -1287,8 +1301,7 @@ class StockFeatureEngineer:
         return df
     
     def create_brownian_motion_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate Brownian motion and statistical physics features"""
-        df = df.copy()
+        """Generate Brownian motion and statistical physics features (adds columns to df in place and returns it)"""
         close = df['close_price'].values
         volume = df['volume'].values
         
@@ -1549,9 +1562,16 @@ class StockFeatureEngineer:
             logger.warning(f"{symbol}: Insufficient data ({len(df)} records). Need at least 200.")
             return pd.DataFrame()
         
+        # Deterministic indicators: reuse cached output when the input data is unchanged
+        cache_path = self._feature_cache_path(df, symbol) if self.cache_dir is not None else None
+        if cache_path is not None and cache_path.exists():
+            logger.info(f"{symbol}: Loaded engineered features from cache {cache_path.name}")
+            return pd.read_parquet(cache_path)
+        
         original_len = len(df)
         
-        # Apply feature engineering steps
+        # Apply feature engineering steps. The first stage returns a new frame; the
+        # stages after it add their columns to that frame in place instead of copying it.
         df = self.create_time_features(df)
         df = self.create_growth_features(df)
         df = self.create_price_indicators(df)
@@ -1588,22 +1608,49 @@ class StockFeatureEngineer:
             symbol
         )
         
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            df_clean.to_parquet(cache_path, compression='snappy')
+        
         return df_clean
         
-    def engineer_multiple_stocks(self, all_data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
-        """Apply feature engineering to multiple stocks"""
-        engineered_data = {}
+    def _engineer_symbol(self, symbol: str, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Engineer features for a single symbol; returns None on failure"""
+        try:
+            engineered_df = self.engineer_all_features(df, symbol)
+            if engineered_df.empty:
+                logger.warning(f"Skipping {symbol}: Feature engineering failed")
+                return None
+            return engineered_df
+        except Exception as e:
+            logger.error(f"Failed to engineer features for {symbol}: {e}")
+            return None
+            
+    def engineer_multiple_stocks(self, all_data: Dict[str, pd.DataFrame],
+                                 n_jobs: int = -1) -> Dict[str, pd.DataFrame]:
+        """
+        Apply feature engineering to multiple stocks
         
-        for symbol, df in all_data.items():
-            try:
-                engineered_df = self.engineer_all_features(df, symbol)
-                if not engineered_df.empty:
-                    engineered_data[symbol] = engineered_df
-                else:
-                    logger.warning(f"Skipping {symbol}: Feature engineering failed")
-            except Exception as e:
-                logger.error(f"Failed to engineer features for {symbol}: {e}")
-                continue
+        Symbols are independent, so they are engineered concurrently in worker
+        processes (the indicator code is CPU-bound Python/NumPy).
+        
+        Args:
+            all_data: Dictionary mapping symbol -> raw price DataFrame
+            n_jobs: Number of parallel worker processes (-1 = all cores)
+            
+        Returns:
+            Dictionary mapping symbol -> engineered DataFrame
+        """
+        symbols = list(all_data.keys())
+        engineered_frames = Parallel(n_jobs=n_jobs, backend='loky', batch_size=1)(
+            delayed(self._engineer_symbol)(symbol, all_data[symbol])
+            for symbol in symbols
+        )
+        
+        engineered_data = {
+            symbol: engineered_df for symbol, engineered_df in zip(symbols, engineered_frames)
+            if engineered_df is not None
+        }
                 
         logger.info(f"Successfully engineered features for {len(engineered_data)} stocks")
         return engineered_data
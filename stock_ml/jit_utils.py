@@ -0,0 +1,20 @@
+"""
+Optional Numba JIT support for stock_ml modules.
+Falls back to no-op decorators so modules import and run (uncompiled) without numba installed.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+__all__ = ['njit', 'prange', 'NUMBA_AVAILABLE']
@@ -6,13 +6,16 @@ Implements advanced parallelization, GPU acceleration, and memory optimizations.
 import pandas as pd
 import numpy as np
 import logging
+import importlib.util
 import multiprocessing
 import psutil
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
-import pickle
 import os
+import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import joblib
 
 import xgboost as xgb
 from sklearn.model_selection import GridSearchCV, StratifiedKFold, cross_val_score
@@ -28,6 +31,8 @@ try:
     VISUALIZATION_AVAILABLE = True
 except ImportError:
     VISUALIZATION_AVAILABLE = False
+# Optional columnar writer for result summaries
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -475,7 +480,7 @@ class HighPerformanceXGBoostTrainer:
         """
         logger.info(f"{symbol}: Starting high-performance XGBoost training...")
         logger.info(f"{symbol}: Using {self.tree_method} method on {self.cpu_cores} cores")
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()  # Monotonic; no wall-clock/tz lookup
         
         # Calculate class balance for scale_pos_weight
         pos_count = (y_train == 1).sum()
@@ -566,7 +571,7 @@ class HighPerformanceXGBoostTrainer:
         val_probabilities = self.model.predict_proba(X_val)[:, 1]
         
         # Calculate metrics
-        training_time = (datetime.now() - start_time).total_seconds()
+        training_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         results = {
             'model': self.model,
@@ -611,12 +616,15 @@ class HighPerformanceXGBoostTrainer:
             booster = self.model.get_booster()
             importance_types = ['weight', 'gain', 'cover']
             
+            scores = {imp_type: booster.get_score(importance_type=imp_type) for imp_type in importance_types}
+            
             importance_data = []
-            for feature in X_train.columns:
+            for i, feature in enumerate(X_train.columns):
                 row = {'feature': feature}
                 for imp_type in importance_types:
-                    scores = booster.get_score(importance_type=imp_type)
-                    row[f'{imp_type}_importance'] = scores.get(f'f{list(X_train.columns).index(feature)}', 0)
+                    # Scores are keyed by column name when fitted on a DataFrame, f<i> otherwise
+                    type_scores = scores[imp_type]
+                    row[f'{imp_type}_importance'] = type_scores.get(feature, type_scores.get(f'f{i}', 0))
                 importance_data.append(row)
             
             feature_importance = pd.DataFrame(importance_data)
@@ -702,11 +710,13 @@ class MultiStockXGBoostTrainer:
         self.use_gpu = use_gpu
         self.force_cpu = force_cpu
         self.trainers = {}
+        self.result_paths = {}
         self.results_summary = None
         
     def train_multiple_stocks(self, preprocessed_data: Dict[str, Dict[str, Any]],
                             grid_type: str = 'comprehensive',
-                            cv_folds: int = 5) -> Dict[str, Dict[str, Any]]:
+                            cv_folds: int = 5,
+                            results_dir: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
         """
         Train high-performance XGBoost models for multiple stocks
         
@@ -714,6 +724,8 @@ class MultiStockXGBoostTrainer:
             preprocessed_data: Dictionary mapping symbol -> preprocessed data
             grid_type: Hyperparameter grid type ('quick', 'comprehensive', 'production', 'aggressive')
             cv_folds: Number of CV folds
+            results_dir: If set, stream each symbol's model and full results to
+                results_dir/{symbol}.joblib and keep only lightweight results in memory
             
         Returns:
             Dictionary of training results with hardware optimization info
@@ -764,7 +776,8 @@ class MultiStockXGBoostTrainer:
                 }
                 
                 # Store trainer and results
-                self.trainers[symbol] = trainer
+                if results_dir is None:
+                    self.trainers[symbol] = trainer
                 all_results[symbol] = {
                     'training_results': train_results,
                     'test_results': test_results
@@ -786,6 +799,14 @@ class MultiStockXGBoostTrainer:
                 }
                 document_predictions(predictions_data, symbol)
                 
+                if results_dir is not None:
+                    # Persist the heavy objects now so they can be reclaimed per symbol
+                    self.result_paths[symbol] = self._stream_results(
+                        results_dir, symbol, train_results, test_results
+                    )
+                    all_results[symbol]['training_results'] = self._slim_training_results(train_results)
+                    del trainer, model, train_results, combined_results
+                
                 logger.info(f"Completed high-performance training for {symbol}")
                 
             except Exception as e:
@@ -799,6 +820,28 @@ class MultiStockXGBoostTrainer:
         
         return all_results
         
+    def _stream_results(self, results_dir: str, symbol: str,
+                        train_results: Dict[str, Any], test_results: Dict[str, Any]) -> Path:
+        """Dump a symbol's model and full training/test results to disk"""
+        save_path = Path(results_dir)
+        save_path.mkdir(parents=True, exist_ok=True)
+        
+        result_path = save_path / f"{symbol}.joblib"
+        joblib.dump({
+            'model': train_results['model'],
+            'training_results': train_results,
+            'test_results': test_results
+        }, result_path, compress=3)
+        logger.info(f"{symbol}: Streamed model and results to {result_path}")
+        return result_path
+        
+    @staticmethod
+    def _slim_training_results(train_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop the model and large per-sample/grid artifacts, keeping scalar metrics"""
+        heavy_keys = {'model', 'val_predictions', 'val_probabilities',
+                      'feature_importance', 'grid_search_results'}
+        return {key: value for key, value in train_results.items() if key not in heavy_keys}
+        
     def _generate_results_summary(self, all_results: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
         """Generate summary of all training results"""
         summary_data = []
@@ -836,20 +879,38 @@ class MultiStockXGBoostTrainer:
         return self.results_summary
         
     def save_all_models(self, save_dir: str):
-        """Save all trained models"""
+        """
+        Save all trained models
+        
+        Models are written concurrently on a thread pool; joblib's zlib compression
+        and file writes release the GIL, so threads overlap without process overhead.
+        """
         save_path = Path(save_dir)
         save_path.mkdir(parents=True, exist_ok=True)
         
-        for symbol, trainer in self.trainers.items():
-            model_path = save_path / f"{symbol}_xgb_model.pkl"
-            # Save the trained model
-            with open(model_path, 'wb') as f:
-                pickle.dump(trainer.model, f)
+        def save_model(item):
+            symbol, trainer = item
+            model_path = save_path / f"{symbol}_xgb_model.joblib"
+            joblib.dump(trainer.model, model_path, compress=3)
+            
+        if self.trainers:
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1, len(self.trainers))) as executor:
+                # Consume the iterator so any save error is raised here
+                list(executor.map(save_model, self.trainers.items()))
+                
+        # Models streamed during training are already on disk
+        for symbol, result_path in self.result_paths.items():
+            logger.info(f"{symbol}: Model already streamed to {result_path}")
                 
         # Save results summary
         if self.results_summary is not None:
-            summary_path = save_path / "training_results_summary.csv"
-            self.results_summary.to_csv(summary_path, index=False)
+            if PARQUET_AVAILABLE:
+                summary_path = save_path / "training_results_summary.parquet"
+                self.results_summary.to_parquet(summary_path, engine='pyarrow',
+                                                compression='zstd', index=False)
+            else:
+                summary_path = save_path / "training_results_summary.csv"
+                self.results_summary.to_csv(summary_path, index=False)
             logger.info(f"High-performance results summary saved to {summary_path}")
             
         logger.info(f"All high-performance models saved to {save_dir}")
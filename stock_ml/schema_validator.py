@@ -102,6 +102,25 @@ class MLSchemaValidator:
         Returns:
             Tuple of (is_valid, error_messages, cleaned_dataframe)
         """
+        is_valid, errors, cleaned_df, _ = self.validate_and_normalize_feature_data(
+            feature_df, model_id, instrument_id
+        )
+        return is_valid, errors, cleaned_df
+    
+    def validate_and_normalize_feature_data(
+        self, feature_df: pd.DataFrame, model_id: int, instrument_id: int
+    ) -> Tuple[bool, List[str], pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        Validate feature data and, in the same pass, derive the per-row arrays used for insertion
+        
+        The arrays are built from the columns already coerced during validation, so callers
+        don't need to re-convert them.
+        
+        Returns:
+            Tuple of (is_valid, error_messages, cleaned_dataframe, normalized), where normalized
+            holds 'trading_date_epoch' (int64), 'volume' (int64, negatives as 0) and
+            'feature_completeness' (float64) arrays; it is empty when validation fails
+        """
         self.logger.info(f"Validating feature data: {len(feature_df)} records, {len(feature_df.columns)} columns")
         
         schema = self.get_table_schema('ml_feature_data')
@@ -136,14 +155,12 @@ class MLSchemaValidator:
             'company_name', 'sector', 'country'
         }
         
-        # 1. Clean up excluded metadata columns first
-        found_excluded = df_columns.intersection(excluded_columns)
-        cleaned_df = feature_df.copy()
+        # 1. Clean up excluded metadata columns first (one drop, which also copies the frame)
+        found_excluded = [col for col in feature_df.columns if col in excluded_columns]
+        cleaned_df = feature_df.drop(columns=found_excluded)
         
         for col in found_excluded:
-            if col in cleaned_df.columns:
-                cleaned_df = cleaned_df.drop(columns=[col])
-                self.logger.info(f"Removed excluded column: {col}")
+            self.logger.info(f"Removed excluded column: {col}")
         
         # Update df_columns after cleanup
         df_columns = set(cleaned_df.columns)
@@ -209,10 +226,25 @@ class MLSchemaValidator:
         except Exception as e:
             errors.append(f"OHLC validation failed: {str(e)}")
         
-        # 5. Prepare additional features JSON
+        # 5. Normalized per-row arrays for insertion
+        normalized = {}
+        if not errors:
+            try:
+                normalized['trading_date_epoch'] = (
+                    pd.to_datetime(cleaned_df['trading_date_local'])
+                    .to_numpy(dtype='datetime64[s]').astype(np.int64)
+                )
+                volume = pd.to_numeric(cleaned_df['volume'], errors='coerce').fillna(0)
+                normalized['volume'] = volume.where(volume >= 0, 0).to_numpy(dtype=np.int64)
+                # Share of non-null cells per row
+                normalized['feature_completeness'] = 1 - cleaned_df.isna().to_numpy().mean(axis=1)
+            except Exception as e:
+                errors.append(f"Normalization failed: {str(e)}")
+        
+        # 6. Additional feature columns (stored positionally in additional_feature_values)
         additional_features_cols = set(cleaned_df.columns) - required_from_df - technical_indicators - programmatic_columns
         if additional_features_cols:
-            self.logger.info(f"Additional features to store in JSON: {len(additional_features_cols)} columns")
+            self.logger.info(f"Additional features to store in additional_feature_values: {len(additional_features_cols)} columns")
         
         is_valid = len(errors) == 0
         
@@ -223,7 +255,7 @@ class MLSchemaValidator:
             for error in errors:
                 self.logger.error(f"  - {error}")
         
-        return is_valid, errors, cleaned_df
+        return is_valid, errors, cleaned_df, normalized
     
     def validate_predictions_data(self, predictions: List, probabilities: List, test_dates: List, model_id: int, instrument_id: int) -> Tuple[bool, List[str]]:
         """
@@ -0,0 +1,41 @@
+"""Tests for the backtest simulation kernel and its NumPy fallback."""
+
+import numpy as np
+import pytest
+
+from stock_ml.backtesting import TradingBacktester, _simulate, _simulate_runs
+
+
+def _run(simulate, prices, signal):
+    backtester = TradingBacktester()
+    n_sim = max(len(prices) - 7, 0)
+    buffers = backtester._alloc_trade_buffers(n_sim + 1)
+    portfolio_values = np.empty(n_sim + 1, dtype=np.float64)
+    stats = simulate(
+        prices, signal, 10000.0, 0.95, 0.001,
+        buffers['bar_index'], buffers['action'], buffers['price'],
+        buffers['shares'], buffers['cost'], buffers['proceeds'],
+        buffers['capital_after'], buffers['trade_return'], portfolio_values
+    )
+    trades = {name: buf[:stats[0]] for name, buf in buffers.items()}
+    return stats, trades, portfolio_values
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_numpy_fallback_matches_kernel(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(0, 400))
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    signal = (rng.random(n) > rng.random()).astype(np.uint8)
+
+    k_stats, k_trades, k_values = _run(_simulate, prices, signal)
+    f_stats, f_trades, f_values = _run(_simulate_runs, prices, signal)
+
+    assert k_stats[0] == f_stats[0]
+    assert k_stats[4] == f_stats[4]
+    np.testing.assert_allclose(k_stats[1:4], f_stats[1:4], rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(k_values, f_values, rtol=1e-12)
+    for name in ('bar_index', 'action', 'shares'):
+        np.testing.assert_array_equal(k_trades[name], f_trades[name])
+    for name in ('price', 'cost', 'proceeds', 'capital_after', 'trade_return'):
+        np.testing.assert_allclose(k_trades[name], f_trades[name], rtol=1e-12, equal_nan=True)
@@ -0,0 +1,49 @@
+"""Tests for the Warsaw Stock Exchange trading calendar."""
+
+from datetime import date
+
+from stock_etl.utils.polish_trading_calendar import PolishTradingCalendar
+
+
+def test_holiday_inside_configured_years_is_not_trading_day():
+    calendar = PolishTradingCalendar(years=[2025])
+
+    assert not calendar.is_trading_day(date(2025, 11, 11))  # Independence Day
+    assert calendar.is_trading_day(date(2025, 11, 12))
+
+
+def test_holiday_past_configured_years_is_not_trading_day():
+    calendar = PolishTradingCalendar(years=[2025])
+
+    assert not calendar.is_trading_day(date(2026, 11, 11))
+    assert calendar.is_trading_day(date(2026, 11, 12))
+    assert calendar.get_holiday_name(date(2026, 11, 11)) != ""
+
+
+def test_holiday_past_default_range_is_not_trading_day():
+    calendar = PolishTradingCalendar()
+
+    assert not calendar.is_trading_day(date(2031, 1, 1))  # New Year's Day
+    assert calendar.is_trading_day(date(2031, 1, 2))
+
+
+def test_gap_between_configured_years_is_covered():
+    calendar = PolishTradingCalendar(years=[2020, 2025])
+
+    assert not calendar.is_trading_day(date(2022, 11, 11))
+    assert date(2022, 11, 11) not in calendar.get_trading_days_in_range(date(2022, 11, 7), date(2022, 11, 14))
+
+
+def test_range_past_configured_years_skips_holidays():
+    calendar = PolishTradingCalendar(years=[2025])
+
+    trading_days = calendar.get_trading_days_in_range(date(2026, 12, 23), date(2027, 1, 4))
+
+    assert trading_days == [
+        date(2026, 12, 23),
+        date(2026, 12, 28),
+        date(2026, 12, 29),
+        date(2026, 12, 30),
+        date(2026, 12, 31),
+        date(2027, 1, 4),
+    ]